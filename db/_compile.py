@@ -0,0 +1,144 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import datetime
+from bson import ObjectId
+
+# Field spec: a type, or a tuple of accepted types (include type(None) for optional fields)
+FieldSpec = Union[type, Tuple[type, ...]]
+
+_TYPE_NAMES = {
+    str: 'string',
+    int: 'int',
+    bool: 'bool',
+    dict: 'dict',
+    list: 'list',
+}
+
+def _type_name(types: Tuple[type, ...]) -> str:
+    names = [_TYPE_NAMES.get(t, t.__name__) for t in types if t is not type(None)]
+    return ' or '.join(names)
+
+def _check_lines(i: int, field: str, spec: FieldSpec, var: str, namespace: Dict[str, Any]) -> List[str]:
+    """Source lines raising TypeError when `var` does not match spec"""
+    types = spec if isinstance(spec, tuple) else (spec,)
+    optional = type(None) in types
+    types = tuple(t for t in types if t is not type(None))
+    namespace[f'_t{i}'] = types[0] if len(types) == 1 else types
+    check = f'type({var}) is not _t{i}' if len(types) == 1 else f'type({var}) not in _t{i}'
+    if optional:
+        check = f'{var} is not None and {check}'
+    return [
+        f'    if {check}:',
+        f'        raise TypeError(f"{field} must be {_type_name(types)}, got {{type({var})}}")',
+    ]
+
+def make_builder(schema: Dict[str, FieldSpec],
+                 oid_fields: Iterable[str] = (),
+                 defaults: Optional[Dict[str, Any]] = None,
+                 oid: Optional[Callable[[str], Any]] = None) -> Callable[..., Dict[str, Any]]:
+    """Compile a schema into a function that validates arguments and builds a document
+
+    The generated function takes the schema fields as parameters in schema
+    order, raises TypeError on the first argument whose exact type is not
+    accepted (messages are only formatted on failure), converts oid_fields
+    with `oid`, and returns the document dict.
+
+    Args:
+        schema: Mapping of field name to accepted type(s)
+        oid_fields: Fields stored as ObjectId references
+        defaults: Parameter defaults; a type (e.g. dict) is a factory called
+            when the argument is None, anything else is the default value
+        oid: Converter for oid_fields
+
+    Returns:
+        Document builder function
+    """
+    oid_fields = set(oid_fields)
+    defaults = defaults or {}
+    unknown = (oid_fields | set(defaults)) - set(schema)
+    if unknown:
+        raise ValueError(f"Fields not in schema: {sorted(unknown)}")
+    if oid_fields and oid is None:
+        raise ValueError("oid converter is required when oid_fields are given")
+
+    namespace: Dict[str, Any] = {'_oid': oid}
+    params, body, items = [], [], []
+    for i, (field, spec) in enumerate(schema.items()):
+        if field in defaults:
+            default = defaults[field]
+            if isinstance(default, type):
+                params.append(f'{field}=None')
+                namespace[f'_f{i}'] = default
+            else:
+                namespace[f'_d{i}'] = default
+                params.append(f'{field}=_d{i}')
+        elif any('=' in p for p in params):
+            raise ValueError(f"Field without default follows defaulted fields: {field}")
+        else:
+            params.append(field)
+        body.extend(_check_lines(i, field, spec, field, namespace))
+        if isinstance(defaults.get(field), type):
+            body.append(f'    if {field} is None: {field} = _f{i}()')
+        items.append(f'{field!r}: _oid({field})' if field in oid_fields else f'{field!r}: {field}')
+
+    lines = [f'def build({", ".join(params)}):', *body, f'    return {{{", ".join(items)}}}']
+    exec('\n'.join(lines), namespace)
+    return namespace['build']
+
+# $jsonSchema bsonType -> Python types pymongo encodes as that BSON type
+_BSON_TYPES = {
+    'string': (str,),
+    'int': (int,),
+    'bool': (bool,),
+    'object': (dict,),
+    'array': (list, tuple),
+    'objectId': (ObjectId,),
+    'binData': (bytes,),
+    'date': (datetime,),
+}
+
+def make_document_validator(json_schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+    """Compile a collection $jsonSchema into a client-side document check
+
+    Supports the subset the collection validators use: top-level `required`
+    and per-property `bsonType`. The generated function raises ValueError for
+    missing required fields and TypeError for a present field of the wrong
+    BSON type, before the document is sent to the server.
+
+    Args:
+        json_schema: $jsonSchema document, as passed to collMod
+
+    Returns:
+        Validator function
+    """
+    namespace: Dict[str, Any] = {'_MISSING': object()}
+    lines = ['def check(doc):']
+    required = list(json_schema.get('required', ()))
+    if required:
+        namespace['_required'] = required
+        present = ' and '.join(f'{field!r} in doc' for field in required)
+        lines += [
+            f'    if not ({present}):',
+            '        raise ValueError(f"Missing required fields: {[f for f in _required if f not in doc]}")',
+        ]
+    for i, (field, spec) in enumerate(json_schema.get('properties', {}).items()):
+        unsupported = set(spec) - {'bsonType', 'description'}
+        if unsupported:
+            raise ValueError(f"Unsupported $jsonSchema keywords for {field}: {sorted(unsupported)}")
+        if 'bsonType' not in spec:
+            continue
+        bson_types = spec['bsonType'] if isinstance(spec['bsonType'], list) else [spec['bsonType']]
+        types = tuple(t for name in bson_types for t in _BSON_TYPES[name])
+        namespace[f'_b{i}'] = types
+        check = f'not isinstance(v, _b{i})'
+        if 'int' in bson_types and 'bool' not in bson_types:
+            # bool is an int subclass but encodes as BSON bool
+            check = f'({check} or type(v) is bool)'
+        lines += [
+            f'    v = doc.get({field!r}, _MISSING)',
+            f'    if v is not _MISSING and {check}:',
+            f'        raise TypeError(f"{field} must be BSON {" or ".join(bson_types)}, got {{type(v)}}")',
+        ]
+    if len(lines) == 1:
+        lines.append('    pass')
+    exec('\n'.join(lines), namespace)
+    return namespace['check']
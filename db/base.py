@@ -1,24 +1,201 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Iterable, Sequence, Tuple, Union
+from copy import deepcopy
 from datetime import datetime
-from pymongo import MongoClient
+from pymongo import IndexModel, WriteConcern
 from pymongo.collection import Collection
+from pymongo.cursor import Cursor
+from pymongo.errors import PyMongoError
 from bson import ObjectId
 import logging
+from functools import lru_cache
+from ._compile import make_builder, make_document_validator
+from .client import get_client
+from lib.cache import TTLCache
+
+# Reference fields accept the stored ObjectId or its hex string
+ObjectIdLike = Union[str, ObjectId]
+OID_TYPES = (str, ObjectId)
+
+@lru_cache(maxsize=4096)
+def _parse_oid(id: str) -> ObjectId:
+    """Parse an ObjectId, memoized since the same references repeat across inserts"""
+    return ObjectId(id)
+
+def _oid(id: ObjectIdLike) -> ObjectId:
+    """Return id as an ObjectId, passing ObjectIds through unchanged"""
+    return id if type(id) is ObjectId else _parse_oid(id)
 
 class BaseDB:
+    # Subclasses override with their own module logger
+    logger = logging.getLogger(__name__)
+    # Field name -> accepted type(s) for insert arguments, compiled per subclass
+    SCHEMA: Dict[str, Any] = {}
+    # (keys, options) pairs backing the find_by_* queries
+    INDEXES: List[Tuple[List[Tuple[str, int]], Dict[str, Any]]] = []
+    # SCHEMA fields stored as ObjectId references
+    OID_FIELDS: Tuple[str, ...] = ()
+    # Insert argument defaults; a type (e.g. dict) is a factory used when the argument is None
+    DEFAULTS: Dict[str, Any] = {}
+    # Seconds find_by_id results stay cached in-process; None disables the cache
+    CACHE_TTL: Optional[float] = None
+    CACHE_SIZE = 10_000
+    # Documents per getMore reply when streaming find() results
+    FIND_BATCH_SIZE = 1000
+    # Unacknowledged writes for ingestion that can be replayed from source
+    FAST_WRITE_CONCERN = WriteConcern(w=0)
+    # Acknowledged but unjournaled writes for ephemeral test fixtures
+    SEED_WRITE_CONCERN = WriteConcern(w=1, j=False)
+    # Collection $jsonSchema (from db.schemas), also checked client-side before writes
+    JSON_SCHEMA: Optional[Dict[str, Any]] = None
+    _doc_validator = staticmethod(lambda doc: None)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'SCHEMA' in cls.__dict__:
+            cls._builder = staticmethod(make_builder(cls.SCHEMA, cls.OID_FIELDS, cls.DEFAULTS, oid=_oid))
+        if 'JSON_SCHEMA' in cls.__dict__:
+            cls._doc_validator = staticmethod(make_document_validator(cls.JSON_SCHEMA))
+        cls._indexes_created = False
+        cls._cache = TTLCache(cls.CACHE_SIZE, cls.CACHE_TTL) if cls.CACHE_TTL else None
+
     def __init__(self, collection_name: str):
-        self.client = MongoClient('mongodb://localhost:27017/')
+        self.client = get_client()
         self.db = self.client['yt_digest']
         self.collection: Collection = self.db[collection_name]
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create the class INDEXES once per process"""
+        cls = type(self)
+        if cls._indexes_created or not self.INDEXES:
+            return
+        cls._indexes_created = True
+        try:
+            self.create_indexes()
+        except PyMongoError as e:
+            self.logger.warning("Failed to create indexes on %s: %s", self.collection.name, e)
+
+    def create_indexes(self) -> List[str]:
+        """Create the class INDEXES (a no-op for indexes that already exist)
+
+        Returns:
+            Names of the indexes
+        """
+        if not self.INDEXES:
+            return []
+        return self.collection.create_indexes(
+            [IndexModel(keys, **options) for keys, options in self.INDEXES]
+        )
+
+    def _build_doc(self, *args, **kwargs) -> Dict[str, Any]:
+        """Validate insert arguments and build the document with the compiled class builder"""
+        try:
+            return self._builder(*args, **kwargs)
+        except TypeError as e:
+            self.logger.error(str(e))
+            raise
+
+    def _check_doc(self, doc: Dict[str, Any]) -> None:
+        """Check a document against the class JSON_SCHEMA without a server round-trip"""
+        try:
+            self._doc_validator(doc)
+        except (TypeError, ValueError) as e:
+            self.logger.error(str(e))
+            raise
+
+    def _fast_collection(self) -> Collection:
+        """Return the collection configured with FAST_WRITE_CONCERN"""
+        fast = self.__dict__.get('_fast')
+        if fast is None:
+            fast = self._fast = self.collection.with_options(write_concern=self.FAST_WRITE_CONCERN)
+        return fast
 
-    def insert_one(self, data: Dict[str, Any]) -> str:
-        """Insert one document and return its ID"""
-        data['created_at'] = datetime.utcnow()
-        data['updated_at'] = datetime.utcnow()
-        result = self.collection.insert_one(data)
+    def _seed_collection(self) -> Collection:
+        """Return the collection configured with SEED_WRITE_CONCERN"""
+        seed = self.__dict__.get('_seed')
+        if seed is None:
+            seed = self._seed = self.collection.with_options(write_concern=self.SEED_WRITE_CONCERN)
+        return seed
+
+    def insert_one(self, data: Dict[str, Any], fast: bool = False, validated: bool = False) -> str:
+        """Insert one document and return its ID
+
+        With fast=True the write is unacknowledged and skips server-side
+        validation, so failures are not reported. The ID is generated
+        client-side and is returned either way. The document is checked
+        against JSON_SCHEMA locally first, except for an acknowledged write
+        of a validated document (built by _build_doc), which the server's
+        validator checks anyway.
+        """
+        if fast or not validated:
+            self._check_doc(data)
+        now = datetime.utcnow()
+        data.setdefault('created_at', now)
+        data['updated_at'] = now
+        if fast:
+            result = self._fast_collection().insert_one(data, bypass_document_validation=True)
+        else:
+            result = self.collection.insert_one(data)
         return str(result.inserted_id)
 
+    def insert_many(self,
+                    docs: Iterable[Dict[str, Any]],
+                    batch_size: int = 500,
+                    ordered: bool = False,
+                    fast: bool = False,
+                    as_str: bool = True,
+                    seed: bool = False,
+                    validated: bool = False) -> List[ObjectIdLike]:
+        """Insert documents in batches and return their IDs in input order
+
+        Args:
+            docs: Documents to insert
+            batch_size: Number of documents sent per insert_many call
+            ordered: Stop at the first failed document if True
+            fast: Send unacknowledged writes; errors are not reported
+            as_str: Return hex strings; False returns the ObjectIds, which can be
+                passed straight to reference fields and $in queries
+            seed: Test fixtures only. For documents known to be new and already
+                type-checked, skip server-side validation and the journal
+                (SEED_WRITE_CONCERN). Never used by the pipeline
+            validated: Documents were built by _build_doc and already
+                type-checked. Their JSON_SCHEMA check is left to the server,
+                unless fast or seed means it would not report or run it
+
+        Returns:
+            Inserted document IDs
+        """
+        docs = list(docs)
+        # Check every document before the first batch so a bad one inserts nothing
+        if fast or seed or not validated:
+            for doc in docs:
+                self._check_doc(doc)
+        # pymongo rejects bypass_document_validation on unacknowledged bulk writes
+        if seed:
+            collection, bypass = self._seed_collection(), True
+        else:
+            collection, bypass = (self._fast_collection() if fast else self.collection), False
+        inserted_ids = []
+        for start in range(0, len(docs), batch_size):
+            batch = docs[start:start + batch_size]
+            now = datetime.utcnow()
+            for doc in batch:
+                doc.setdefault('created_at', now)
+                doc['updated_at'] = now
+            result = collection.insert_many(batch, ordered=ordered, bypass_document_validation=bypass)
+            inserted_ids.extend(map(str, result.inserted_ids) if as_str else result.inserted_ids)
+        return inserted_ids
+
+    def find(self, query: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> Cursor:
+        """Return a streaming cursor over documents matching the query
+
+        Args:
+            query: MongoDB filter
+            fields: Only return these fields (plus _id); all fields if None
+        """
+        projection = dict.fromkeys(fields, 1) if fields else None
+        return self.collection.find(query, projection).batch_size(self.FIND_BATCH_SIZE)
+
     def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find one document matching the query"""
         return self.collection.find_one(query)
@@ -30,9 +207,61 @@ class BaseDB:
             query,
             {'$set': update_data}
         )
+        self.invalidate(query.get('_id'))
         return result.modified_count > 0 
+
+    def invalidate(self, id: Any = None) -> None:
+        """Drop a document from the find_by_id cache, or the whole cache if id is None"""
+        if self._cache is None:
+            return
+        if isinstance(id, (str, ObjectId)):
+            self._cache.pop(str(id))
+        else:
+            self._cache.clear()
     
-    def find_by_id(self, id: str) -> Dict[str, Any]:
-        """Find keyword by ID"""
-        id = ObjectId(id)
-        return self.find_one({'_id': id})
\ No newline at end of file
+    def find_by_id(self, id: ObjectIdLike) -> Dict[str, Any]:
+        """Find document by ID, served from the class cache when enabled
+
+        Cached documents are returned as copies, so callers may modify them.
+        """
+        cache = self._cache
+        if cache is None:
+            return self.find_one({'_id': _oid(id)})
+        key = str(id)
+        doc = cache.get(key)
+        if doc is None:
+            doc = self.find_one({'_id': _oid(id)})
+            if doc is None:
+                return None
+            cache.set(key, doc)
+        return deepcopy(doc)
+
+    def find_many(self, ids: Iterable[ObjectIdLike]) -> Dict[ObjectIdLike, Dict[str, Any]]:
+        """Find documents by ID with one query for everything not already cached
+
+        Args:
+            ids: Document IDs
+
+        Returns:
+            Dict of ID (as passed in) -> document; IDs that were not found are
+            omitted. With the cache enabled the documents are copies.
+        """
+        found: Dict[ObjectIdLike, Dict[str, Any]] = {}
+        # Cache keys are hex strings whichever form the caller passes
+        missing: Dict[str, ObjectIdLike] = {}
+        cache = self._cache
+        for id in dict.fromkeys(ids):
+            key = str(id)
+            doc = cache.get(key) if cache is not None else None
+            if doc is None:
+                missing[key] = id
+            else:
+                found[id] = deepcopy(doc)
+        if missing:
+            for doc in self.collection.find({'_id': {'$in': [_oid(id) for id in missing.values()]}}):
+                key = str(doc['_id'])
+                if cache is not None:
+                    cache.set(key, doc)
+                    doc = deepcopy(doc)
+                found[missing[key]] = doc
+        return found
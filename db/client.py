@@ -0,0 +1,45 @@
+from typing import Any, Dict, Optional
+from pymongo import MongoClient
+import os
+import threading
+
+_CLIENTS: Dict[str, MongoClient] = {}
+_CLIENT_LOCK = threading.Lock()
+
+_DEFAULT_OPTIONS = {
+    'maxPoolSize': 50,
+    'minPoolSize': 5,
+    'maxIdleTimeMS': 60000,
+    'retryWrites': True,
+    'compressors': 'zlib',
+}
+
+def get_client(uri: Optional[str] = None, **options: Any) -> MongoClient:
+    """Return the process-wide MongoClient for a URI, creating it on first use
+
+    All DB classes and scripts share these clients and their connection
+    pools; they live for the whole process, so only close them through
+    close_clients().
+
+    Args:
+        uri: MongoDB connection string (default: MONGO_URI or localhost)
+        **options: MongoClient options overriding the defaults. They only
+            apply when the client is created; call get_client with them
+            before anything else connects (e.g. from a test fixture)
+    """
+    uri = uri or os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+    client = _CLIENTS.get(uri)
+    if client is None:
+        with _CLIENT_LOCK:
+            client = _CLIENTS.get(uri)
+            if client is None:
+                client = _CLIENTS[uri] = MongoClient(uri, **{**_DEFAULT_OPTIONS, **options})
+    return client
+
+def close_clients() -> None:
+    """Close every shared client; the next get_client() call reconnects"""
+    with _CLIENT_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
@@ -1,14 +1,33 @@
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from .base import BaseDB
-
-logger = logging.getLogger(__name__)
+from typing import Dict, Any, List, Optional, Sequence
+from pymongo.cursor import Cursor
+from .base import BaseDB, ObjectIdLike
+from .schemas import KEYWORDS_SCHEMA
 
 class KeywordsDB(BaseDB):
+    logger = logging.getLogger(__name__)
+
+    SCHEMA = {
+        'keyword': str,
+        'rank': int,
+        'score': int,
+        'platform': str,
+        'region': str,
+        'metadata': (dict, type(None)),
+    }
+    
+    JSON_SCHEMA = KEYWORDS_SCHEMA
+    
+    DEFAULTS = {'metadata': dict}
+    # Documents are not edited after ingestion, so lookups are safe to cache briefly
+    CACHE_TTL = 300
+    
+    INDEXES = [
+        ([('platform', 1), ('region', 1), ('rank', 1)], {}),
+    ]
+    
     def __init__(self):
         super().__init__('keywords')
-        self.logger = logger
     
     def insert_keyword(self, 
                       keyword: str,
@@ -16,7 +35,8 @@ class KeywordsDB(BaseDB):
                       score: int,
                       platform: str,
                       region: str,
-                      metadata: Optional[Dict[str, Any]] = None) -> str:
+                      metadata: Optional[Dict[str, Any]] = None,
+                      fast: bool = False) -> str:
         """Insert a keyword into the database
         
         Args:
@@ -26,60 +46,47 @@ class KeywordsDB(BaseDB):
             platform: Source platform (e.g. google_trends, youtube_trending)
             region: Region code (e.g. TW, JP)
             metadata: Additional metadata
+            fast: Unacknowledged write, see BaseDB.insert_one
             
         Returns:
             Inserted document ID
         """
-        # Type validation
-        if not isinstance(keyword, str):
-            self.logger.error(f"keyword must be string, got {type(keyword)}")
-            raise TypeError(f"keyword must be string, got {type(keyword)}")
-        if not isinstance(rank, int):
-            self.logger.error(f"rank must be int, got {type(rank)}")
-            raise TypeError(f"rank must be int, got {type(rank)}")
-        if not isinstance(score, int):
-            self.logger.error(f"score must be int, got {type(score)}")
-            raise TypeError(f"score must be int, got {type(score)}")
-        if not isinstance(platform, str):
-            self.logger.error(f"platform must be string, got {type(platform)}")
-            raise TypeError(f"platform must be string, got {type(platform)}")
-        if not isinstance(region, str):
-            self.logger.error(f"region must be string, got {type(region)}")
-            raise TypeError(f"region must be string, got {type(region)}")
-        if metadata is not None and not isinstance(metadata, dict):
-            self.logger.error(f"metadata must be dict, got {type(metadata)}")
-            raise TypeError(f"metadata must be dict, got {type(metadata)}")
-
-        #self.logger.debug(f"Inserting keyword: {keyword} with rank {rank}")
-        
-        now = datetime.now()
-        
-        # Prepare document
-        doc = {
-            'keyword': keyword,
-            'rank': rank,
-            'score': score,
-            'platform': platform,
-            'region': region,
-            'metadata': metadata or {},
-            'created_at': now,
-            'updated_at': now
-        }
+        doc = self._build_doc(keyword, rank, score, platform, region, metadata)
         
         # Insert document
         try:
-            result = self.insert_one(doc)
-            self.logger.debug(f"Successfully inserted keyword: {keyword}")
+            result = self.insert_one(doc, fast=fast, validated=True)
+            self.logger.debug("Successfully inserted keyword: %s", keyword)
             return str(result)
         except Exception as e:
             self.logger.error(f"Failed to insert keyword: {e}")
             raise
     
-    def find_by_platform_region(self, platform: str, region: str) -> List[Dict[str, Any]]:
-        """Find keywords by platform and region"""
-        return list(self.find({
+    def insert_keywords_bulk(self, keywords: List[Dict[str, Any]], **kwargs) -> List[ObjectIdLike]:
+        """Insert many keywords with batched writes
+        
+        Args:
+            keywords: Dicts with the same fields as insert_keyword
+            **kwargs: Passed through to BaseDB.insert_many (batch_size, ordered, fast, as_str, seed)
+            
+        Returns:
+            Inserted document IDs in input order
+        """
+        docs = [self._build_doc(**kw) for kw in keywords]
+        try:
+            ids = self.insert_many(docs, validated=True, **kwargs)
+            self.logger.debug("Successfully inserted %s keywords", len(ids))
+            return ids
+        except Exception as e:
+            self.logger.error(f"Failed to insert keywords: {e}")
+            raise
+    
+    def find_by_platform_region(self,
+                                platform: str,
+                                region: str,
+                                fields: Optional[Sequence[str]] = None) -> Cursor:
+        """Find keywords by platform and region, ordered by rank"""
+        return self.find({
             'platform': platform,
             'region': region
-        }).sort('rank', 1)) 
-    
-    
\ No newline at end of file
+        }, fields).sort('rank', 1)
@@ -0,0 +1,50 @@
+# Collection $jsonSchema validators, applied server-side by scripts/init_db.py
+# and compiled client-side by the db classes (see BaseDB.JSON_SCHEMA).
+#
+# They keep the required fields plus the types other collections rely on
+# (ObjectId references, the compressed transcript). Per-field string/int
+# checks are left to the insert-argument SCHEMA of each db class, so the
+# server does not repeat them on every insert.
+KEYWORDS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['keyword', 'rank', 'score', 'platform', 'region']
+}
+
+VIDEOS_SCHEMA = {
+    'bsonType': 'object',
+    'required': [
+        'keyword_id', 'video_category', 'video_thumbnail_url',
+        'video_url', 'video_youtube_id', 'video_title', 'video_duration',
+        'video_views', 'video_likes', 'video_language', 'video_comments'
+    ],
+    'properties': {
+        'keyword_id': {'bsonType': 'objectId'}
+    }
+}
+
+TRANSCRIPTS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['video_id', 'transcript_zlib', 'transcript_len', 'language'],
+    'properties': {
+        'video_id': {'bsonType': 'objectId'},
+        'transcript_zlib': {'bsonType': 'binData'}
+    }
+}
+
+ARTICLES_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['keyword_id', 'transcript_id', 'video_id', 'article_language', 'title', 'content', 'tags', 'seo_metadata'],
+    'properties': {
+        'keyword_id': {'bsonType': 'objectId'},
+        'transcript_id': {'bsonType': 'objectId'},
+        'video_id': {'bsonType': 'objectId'}
+    }
+}
+
+# $jsonSchema validator applied to each collection
+SCHEMAS = {
+    'keywords': KEYWORDS_SCHEMA,
+    'videos': VIDEOS_SCHEMA,
+    'transcripts': TRANSCRIPTS_SCHEMA,
+    'articles': ARTICLES_SCHEMA
+}
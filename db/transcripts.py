@@ -1,18 +1,36 @@
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from bson import ObjectId
-from .base import BaseDB
+from typing import Dict, Any, Optional, Iterator, List, Sequence
+from bson import Binary
+from .base import BaseDB, ObjectIdLike, OID_TYPES, _oid
+from .schemas import TRANSCRIPTS_SCHEMA
 import logging
-
-logger = logging.getLogger(__name__)
+import zlib
 
 class TranscriptsDB(BaseDB):
+    logger = logging.getLogger(__name__)
+
+    SCHEMA = {
+        'video_id': OID_TYPES,
+        'transcript': str,
+        'language': str,
+    }
+    
+    JSON_SCHEMA = TRANSCRIPTS_SCHEMA
+    
+    OID_FIELDS = ('video_id',)
+    
+    INDEXES = [
+        ([('video_id', 1)], {'unique': True}),
+        ([('language', 1)], {}),
+    ]
+    
+    # zlib level: transcripts are plain text, higher levels buy little extra ratio
+    COMPRESS_LEVEL = 6
+
     def __init__(self):
         super().__init__('transcripts')
-        self.logger = logger
     
     def insert_transcript(self,
-                         video_id: str,
+                         video_id: ObjectIdLike,
                          transcript: str,
                          language: str) -> str:
         """Insert a transcript into the database
@@ -25,39 +43,70 @@ class TranscriptsDB(BaseDB):
         Returns:
             Inserted document ID
         """
-        # Type validation
-        if not isinstance(video_id, str):
-            self.logger.error(f"video_id must be string, got {type(video_id)}")
-            raise TypeError(f"video_id must be string, got {type(video_id)}")
-        if not isinstance(transcript, str):
-            self.logger.error(f"transcript must be string, got {type(transcript)}")
-            raise TypeError(f"transcript must be string, got {type(transcript)}")
-        if not isinstance(language, str):
-            self.logger.error(f"language must be string, got {type(language)}")
-            raise TypeError(f"language must be string, got {type(language)}")
-
-        now = datetime.now()
-        
-        doc = {
-            'video_id': ObjectId(video_id),  # 轉換為 ObjectId
-            'transcript': transcript,
-            'language': language,
-            'created_at': now,
-            'updated_at': now
-        }
+        doc = self._deflate(self._build_doc(video_id, transcript, language))
         
         try:
-            result = self.insert_one(doc)
-            self.logger.debug(f"Successfully inserted transcript for video: {video_id}")
+            result = self.insert_one(doc, validated=True)
+            self.logger.debug("Successfully inserted transcript for video: %s", video_id)
             return str(result)
         except Exception as e:
             self.logger.error(f"Failed to insert transcript: {e}")
             raise
     
+    def insert_transcripts_bulk(self, transcripts: List[Dict[str, Any]], **kwargs) -> List[ObjectIdLike]:
+        """Insert many transcripts with batched writes
+        
+        Args:
+            transcripts: Dicts with the same fields as insert_transcript
+            **kwargs: Passed through to BaseDB.insert_many (batch_size, ordered, fast, as_str, seed)
+            
+        Returns:
+            Inserted document IDs in input order
+        """
+        docs = [self._deflate(self._build_doc(**transcript)) for transcript in transcripts]
+        try:
+            ids = self.insert_many(docs, validated=True, **kwargs)
+            self.logger.debug("Successfully inserted %s transcripts", len(ids))
+            return ids
+        except Exception as e:
+            self.logger.error(f"Failed to insert transcripts: {e}")
+            raise
+    
+    def _deflate(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the 'transcript' field of a built document with its compressed form"""
+        # 內文壓縮後存為 Binary，讀取時由 _inflate 還原
+        text = doc.pop('transcript')
+        doc['transcript_zlib'] = Binary(zlib.compress(text.encode('utf-8'), self.COMPRESS_LEVEL))
+        doc['transcript_len'] = len(text)
+        return doc
+    
+    @staticmethod
+    def _inflate(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Restore the 'transcript' field of a stored document"""
+        if doc is not None and 'transcript_zlib' in doc:
+            doc['transcript'] = zlib.decompress(doc.pop('transcript_zlib')).decode('utf-8')
+        return doc
+
+    def get_transcript(self, video_id: str) -> Optional[str]:
+        """Return the transcript text for a video, or None if not found"""
+        doc = self.collection.find_one(
+            {'video_id': _oid(video_id)},
+            {'transcript_zlib': 1, 'transcript': 1}
+        )
+        doc = self._inflate(doc)
+        return doc.get('transcript') if doc else None
+
     def find_by_video_id(self, video_id: str) -> Optional[Dict[str, Any]]:
         """Find transcript by video ID"""
-        return self.find_one({'video_id': ObjectId(video_id)})
+        return self._inflate(self.find_one({'video_id': _oid(video_id)}))
     
-    def find_by_language(self, language: str) -> List[Dict[str, Any]]:
-        """Find all transcripts in a specific language"""
-        return list(self.collection.find({'language': language})) 
\ No newline at end of file
+    def find_by_language(self,
+                         language: str,
+                         fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Find all transcripts in a specific language
+
+        Pass 'transcript' in fields to include the (decompressed) text.
+        """
+        if fields:
+            fields = ['transcript_zlib' if f == 'transcript' else f for f in fields]
+        return (self._inflate(doc) for doc in self.find({'language': language}, fields))
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+import threading
+import time
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after being set"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries; the least recently used is evicted first
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value (expired or not)"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+# Seconds API responses stay fresh, per kind of data
+API_TTLS = {
+    'trending': 10 * 60,
+    'search': 15 * 60,
+    'channels': 60 * 60,
+}
+
+_API_CACHES = {kind: TTLCache(maxsize=512, ttl=ttl) for kind, ttl in API_TTLS.items()}
+
+def api_cache(kind: str) -> TTLCache:
+    """Return the response cache for one kind of API data"""
+    return _API_CACHES[kind]
+
+def api_cache_key(endpoint: str, params: Dict[str, Any]) -> Hashable:
+    """Cache key for one API request"""
+    return (endpoint, frozenset(params.items()))
+
+def cached_execute(kind: str,
+                   endpoint: str,
+                   params: Dict[str, Any],
+                   execute: Callable[[], Any]) -> Any:
+    """
+    Return a cached API response, calling execute() on a miss
+
+    Responses are shared between callers and must be treated as read-only.
+    Failed calls raise and are not cached.
+
+    Args:
+        kind: Key of API_TTLS selecting the cache and its TTL
+        endpoint: Name of the API method, part of the cache key
+        params: Request parameters (hashable values), part of the cache key
+        execute: Performs the request and returns the parsed response
+
+    Returns:
+        API response
+    """
+    cache = _API_CACHES[kind]
+    key = api_cache_key(endpoint, params)
+    response = cache.get(key, _MISSING)
+    if response is _MISSING:
+        response = execute()
+        cache.set(key, response)
+    return response
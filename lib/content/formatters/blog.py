@@ -1,4 +1,4 @@
-from ..generator import ArticleGenerator
+from ..generator import ArticleGenerator, Writer
 
 class BlogFormatter(ArticleGenerator):
     def generate(self) -> str:
@@ -6,30 +6,30 @@ class BlogFormatter(ArticleGenerator):
         Generate a blog-style article
         """
         metadata = self.get_metadata()
-        content = self.content
-        
-        # Basic blog template
-        article = f"""
-# {metadata['title']}
+        self._reset_output()
+        write = self._buffer.write
 
-By {metadata['author']} | {metadata['date']}
+        # Basic blog template: header, then each section writes its own parts
+        write('# ')
+        write(metadata['title'])
+        write('\n\nBy ')
+        write(metadata['author'])
+        write(' | ')
+        write(metadata['date'])
+        self._generate_introduction(write)
+        self._generate_body(write)
+        self._generate_conclusion(write)
+        return self._output()
 
-{self._generate_introduction()}
-
-{self._generate_body()}
-
-{self._generate_conclusion()}
-        """
-        return article.strip()
-    
-    def _generate_introduction(self) -> str:
+    def _generate_introduction(self, write: Writer) -> None:
         # Implementation for intro generation
+        # Sections write '\n\n' followed by their text
         pass
-    
-    def _generate_body(self) -> str:
+
+    def _generate_body(self, write: Writer) -> None:
         # Implementation for main content
         pass
-    
-    def _generate_conclusion(self) -> str:
+
+    def _generate_conclusion(self, write: Writer) -> None:
         # Implementation for conclusion
-        pass 
\ No newline at end of file
+        pass
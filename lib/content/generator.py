@@ -1,4 +1,9 @@
 from abc import ABC, abstractmethod
+from io import StringIO
+from typing import Callable
+
+# Section writers receive the output buffer's write method
+Writer = Callable[[str], object]
 
 class ArticleGenerator(ABC):
     def __init__(self, content: dict):
@@ -7,6 +12,25 @@ class ArticleGenerator(ABC):
         content: dict containing video metadata, transcript, and analyzed content
         """
         self.content = content
+        self._buffer = StringIO()
+    
+    def write(self, chunk: str) -> None:
+        """
+        Append a chunk to the article being generated
+        """
+        self._buffer.write(chunk)
+    
+    def _reset_output(self) -> None:
+        """
+        Start a new article, discarding any previous output
+        """
+        self._buffer = StringIO()
+    
+    def _output(self) -> str:
+        """
+        Return everything written since the last reset
+        """
+        return self._buffer.getvalue()
     
     @abstractmethod
     def generate(self) -> str:
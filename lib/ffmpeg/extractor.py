@@ -1,28 +1,73 @@
 import subprocess
 import os
-from typing import Dict, Optional
+import shutil
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import av  # PyAV: probe and stream-copy in-process instead of spawning ffmpeg
+except ImportError:
+    av = None
+
+@lru_cache(maxsize=1)
+def _find_binaries() -> Tuple[Optional[str], Optional[str]]:
+    """Resolve the ffmpeg and ffprobe executables once per process"""
+    return shutil.which('ffmpeg'), shutil.which('ffprobe')
 
 class FFmpegExtractor:
+    # Source audio codecs that can be stream-copied, and the container to copy them into
+    _COPY_EXTENSIONS = {
+        'mp3': 'mp3',
+        'aac': 'm4a',
+    }
+    
     def __init__(self):
         """
         Initialize FFmpeg extractor
         Raises RuntimeError if ffmpeg is not installed
         """
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
+        self._bin, self._probe_bin = _find_binaries()
+        if not self._bin:
             raise RuntimeError("FFmpeg is not installed. Please install FFmpeg first.")
 
-    def extract_audio(self, video_path: str, output_dir: Optional[str] = None) -> Dict[str, str]:
+    def _probe_audio_codec(self, video_path: str) -> Optional[str]:
         """
-        Extract audio from video file
+        Get the codec name of the first audio stream
         
-        Args:
-            video_path: Path to video file
-            output_dir: Directory to save extracted audio (default: same as video)
-            
         Returns:
-            Dict containing paths to the original video and extracted audio
+            Codec name (e.g. 'aac', 'mp3'), or None if it cannot be determined
+        """
+        if av is not None:
+            try:
+                with av.open(video_path) as container:
+                    streams = container.streams.audio
+                    return streams[0].codec_context.name if streams else None
+            except Exception:
+                pass  # Fall back to ffprobe
+        
+        if not self._probe_bin:
+            return None
+        
+        command = [
+            self._probe_bin,
+            '-v', 'error',
+            '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_name',
+            '-of', 'csv=p=0',
+            video_path
+        ]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, check=True)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            return None
+        return result.stdout.strip() or None
+    
+    def _plan_output(self, video_path: str, output_dir: Optional[str]) -> Tuple[str, str, List[str]]:
+        """
+        Decide where and how the audio of one video is written
+        
+        Returns:
+            (video_id, audio_path, codec_args)
         """
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
@@ -35,28 +80,96 @@ class FFmpegExtractor:
         output_dir = output_dir or video_dir
         os.makedirs(output_dir, exist_ok=True)
         
+        # Copy the audio stream as-is when it is already MP3/AAC, otherwise encode to MP3
+        codec = self._probe_audio_codec(video_path)
+        if codec in self._COPY_EXTENSIONS:
+            extension = self._COPY_EXTENSIONS[codec]
+            codec_args = ['-c:a', 'copy']
+        else:
+            extension = 'mp3'
+            codec_args = [
+                '-acodec', 'libmp3lame',  # Use MP3 codec
+                '-q:a', '6',  # Audio quality (0-9, lower is better), still fine for ASR
+            ]
+        
         # Generate output audio path
-        audio_path = os.path.join(output_dir, f"{video_id}.mp3")
+        audio_path = os.path.join(output_dir, f"{video_id}.{extension}")
+        return video_id, audio_path, codec_args
+    
+    def _run(self, command: List[str]) -> None:
+        """Run FFmpeg, discarding stdout and keeping stderr for errors"""
+        subprocess.run(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True
+        )
+    
+    @staticmethod
+    def _remux_audio(video_path: str, audio_path: str) -> bool:
+        """
+        Copy the first audio stream into audio_path with PyAV, without decoding
+        
+        Returns:
+            True on success; False (with any partial output removed) so the
+            caller can fall back to the ffmpeg binary
+        """
+        try:
+            with av.open(video_path) as source, av.open(audio_path, 'w') as target:
+                in_stream = source.streams.audio[0]
+                if hasattr(target, 'add_stream_from_template'):
+                    out_stream = target.add_stream_from_template(in_stream)
+                else:
+                    out_stream = target.add_stream(template=in_stream)
+                for packet in source.demux(in_stream):
+                    # The demuxer ends with an empty flush packet
+                    if packet.dts is None:
+                        continue
+                    packet.stream = out_stream
+                    target.mux(packet)
+            if os.path.getsize(audio_path) > 0:
+                return True
+        except Exception:
+            pass
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+        return False
+    
+    def extract_audio(self, video_path: str, output_dir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extract audio from video file
+        
+        Args:
+            video_path: Path to video file
+            output_dir: Directory to save extracted audio (default: same as video)
+            
+        Returns:
+            Dict containing paths to the original video and extracted audio
+        """
+        video_id, audio_path, codec_args = self._plan_output(video_path, output_dir)
+        
+        if av is not None and codec_args == ['-c:a', 'copy'] and self._remux_audio(video_path, audio_path):
+            return {
+                'video': video_path,
+                'audio': audio_path,
+                'video_id': video_id
+            }
         
         try:
             # Extract audio using FFmpeg
             command = [
-                'ffmpeg',
+                self._bin,
+                '-nostdin',  # Never wait on stdin
+                '-hide_banner',
+                '-loglevel', 'error',  # Only write actual errors to stderr
                 '-i', video_path,  # Input video
                 '-vn',  # Disable video
-                '-acodec', 'libmp3lame',  # Use MP3 codec
-                '-q:a', '4',  # Audio quality (0-9, lower is better)
+                *codec_args,
+                '-threads', '0',  # Let FFmpeg pick the thread count
                 '-y',  # Overwrite output file
                 audio_path
             ]
-            
-            # Run FFmpeg command
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            self._run(command)
             
             if not os.path.exists(audio_path):
                 raise RuntimeError("Audio extraction failed: Output file not created")
@@ -68,6 +181,73 @@ class FFmpegExtractor:
             }
             
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"FFmpeg error: {e.stderr}")
+            stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else ''
+            raise RuntimeError(f"FFmpeg error: {stderr}")
         except Exception as e:
             raise RuntimeError(f"Failed to extract audio: {str(e)}")
+    
+    def extract_audio_batch(self,
+                            video_paths: Sequence[str],
+                            output_dir: Optional[str] = None,
+                            max_inputs: int = 16) -> List[Dict[str, str]]:
+        """
+        Extract audio from several videos with one FFmpeg process per chunk
+        
+        Each chunk of up to max_inputs files is opened as separate inputs and
+        mapped to one output each, so process startup and codec setup are paid
+        once per chunk instead of once per file. If a chunk fails (e.g. one file
+        has no audio stream), its files are retried one by one with extract_audio.
+        
+        Args:
+            video_paths: Paths to video files
+            output_dir: Directory to save extracted audio (default: same as each video)
+            max_inputs: Maximum number of files handled by one FFmpeg process
+            
+        Returns:
+            List of dicts as returned by extract_audio, in input order
+            
+        Raises:
+            ValueError: If two different videos would be written to the same
+                audio file (e.g. same basename in different directories)
+        """
+        # Plan every output up front so a collision is caught before anything is written;
+        # a video listed more than once is extracted once
+        plans = {}
+        owners = {}
+        for path in video_paths:
+            key = os.path.abspath(path)
+            if key in plans:
+                continue
+            plan = self._plan_output(path, output_dir)
+            owner = owners.setdefault(os.path.abspath(plan[1]), path)
+            if os.path.abspath(owner) != key:
+                raise ValueError(f"{owner} and {path} would both be extracted to {plan[1]}")
+            plans[key] = (path, plan)
+        
+        unique = list(plans.values())
+        extracted = {}
+        for start in range(0, len(unique), max_inputs):
+            chunk = unique[start:start + max_inputs]
+            
+            command = [self._bin, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y']
+            for path, _ in chunk:
+                command += ['-i', path]
+            for i, (_, (_, audio_path, codec_args)) in enumerate(chunk):
+                command += ['-map', f'{i}:a:0', *codec_args, '-threads', '0', audio_path]
+            
+            try:
+                self._run(command)
+            except subprocess.CalledProcessError:
+                for path, _ in chunk:
+                    extracted[os.path.abspath(path)] = self.extract_audio(path, output_dir)
+                continue
+            
+            for path, (video_id, audio_path, _) in chunk:
+                if not os.path.exists(audio_path):
+                    raise RuntimeError(f"Audio extraction failed: Output file not created for {path}")
+                extracted[os.path.abspath(path)] = {
+                    'video': path,
+                    'audio': audio_path,
+                    'video_id': video_id
+                }
+        return [dict(extracted[os.path.abspath(path)]) for path in video_paths]
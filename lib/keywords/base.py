@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
 from ..region import Region  # Add this import
@@ -58,6 +58,29 @@ class KeywordsFetcher(ABC):
         """Clean and normalize keyword text"""
         return keyword.strip()
     
+    def rank_keywords(self, candidates, limit: int) -> List[Tuple[int, str]]:
+        """
+        Assign ranks to the first `limit` candidates and drop unusable ones
+        
+        Ranks follow the source position, so a skipped entry leaves a gap.
+        
+        Args:
+            candidates: Raw keyword values in trending order
+            limit: Maximum number of candidates to consider
+            
+        Returns:
+            List of (rank, cleaned keyword) tuples
+        """
+        head = candidates[:limit]
+        ranked = [
+            (rank, clean)
+            for rank, keyword in enumerate(head, 1)
+            if isinstance(keyword, str) and (clean := self.clean_keyword(keyword))
+        ]
+        if len(ranked) < len(head):
+            self.logger.warning(f"Skipped {len(head) - len(ranked)} non-string or empty keywords")
+        return ranked
+    
     def validate_result(self, result: List[Dict[str, any]]) -> bool:
         """
         Validate fetched results
@@ -1,43 +1,54 @@
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from pytrends.request import TrendReq
-import pandas as pd
+import numpy as np
 import time
+from types import MappingProxyType
+from functools import lru_cache
 from .base import KeywordsFetcher
 from ..region import Region
 
+@lru_cache(maxsize=1)
+def _trend_req() -> TrendReq:
+    """Process-wide pytrends client shared by every region's fetcher
+    
+    TrendReq requests a Google cookie when constructed, so sharing one
+    instance pays that round-trip once per run instead of once per region.
+    """
+    # 移除 timeout 設置，只保留其他請求參數
+    return TrendReq(
+        hl='en-US',
+        tz=360,
+        timeout=(10,30),
+        requests_args={
+            'headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36'
+            },
+            'verify': True
+        }
+    )
+
 class GoogleTrendsFetcher(KeywordsFetcher):
+    # Region code -> pytrends country name
+    _CODE_MAPPING = MappingProxyType({
+        'TW': 'taiwan',
+        'HK': 'hong_kong',
+        'JP': 'japan',
+        'KR': 'south_korea',
+        'US': 'united_states',
+        'SG': 'singapore',
+        'WORLDWIDE': 'united_states'  # 如果沒有指定地區，使用 US
+    })
+
     def __init__(self, region: str | Region = Region.TAIWAN):
         super().__init__(region)
-        # 移除 timeout 設置，只保留其他請求參數
-        self.pytrends = TrendReq(
-            hl='en-US',
-            tz=360,
-            timeout=(10,30),
-            requests_args={
-                'headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36'
-                },
-                'verify': True
-            }
-        )
+        self.pytrends = _trend_req()
         self.country_code = self._convert_region_code(self.region.get_google_code())
         self.logger.info(f"Initialized GoogleTrendsFetcher for region: {self.region} (country_code: {self.country_code})")
     
     def _convert_region_code(self, code: str) -> str:
         """Convert region code to pytrends format"""
-        code_mapping = {
-            'TW': 'taiwan',
-            'HK': 'hong_kong',
-            'JP': 'japan',
-            'KR': 'south_korea',
-            'US': 'united_states',
-            'SG': 'singapore',
-            'WORLDWIDE': 'united_states'  # 如果沒有指定地區，使用 US
-        }
-        result = code_mapping.get(code.upper(), code.lower())
-        self.logger.debug(f"Converting region code {code} to {result}")
-        return result
+        return self._CODE_MAPPING.get(code.upper(), code.lower())
     
     def fetch(self, limit: int = 10) -> List[Dict[str, any]]:
         """Fetch current trending searches from Google Trends"""
@@ -50,45 +61,35 @@ class GoogleTrendsFetcher(KeywordsFetcher):
                 pn=self.country_code
             )
             
-            self.logger.debug(f"Received response type: {type(trending)}")
-            self.logger.debug(f"Response content: {trending}")
+            self.logger.debug("Received response type: %s", type(trending))
+            self.logger.debug("Response content: %s", trending)
             
             if trending is None:
                 self.logger.warning("Received None response from Google Trends")
                 return []
             
-            # 轉換為列表格式
-            if isinstance(trending, pd.DataFrame):
-                trending = trending.values.flatten().tolist()
-            elif isinstance(trending, pd.Series):
-                trending = trending.tolist()
-            elif not isinstance(trending, list):
-                trending = list(trending)
+            # 轉換為一維陣列 (DataFrame / Series / list 皆適用)
+            trending = np.asarray(trending, dtype=object).ravel()
             
             self.logger.info(f"Found {len(trending)} trending searches")
             
-            results = []
-            for rank, keyword in enumerate(trending[:limit], 1):
-                if not isinstance(keyword, str):
-                    self.logger.warning(f"Skipping non-string keyword: {keyword}")
-                    continue
-                
-                clean_keyword = self.clean_keyword(keyword)
-                if not clean_keyword:
-                    self.logger.warning(f"Skipping empty keyword after cleaning: {keyword}")
-                    continue
-                
-                results.append({
-                    'keyword': clean_keyword,
+            # Every row of one response shares the same metadata
+            metadata = {
+                'platform': 'google_trends',
+                'region': str(self.region),
+                'type': 'trending',
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            results = [
+                {
+                    'keyword': keyword,
                     'rank': rank,
                     'score': None,
-                    'metadata': {
-                        'platform': 'google_trends',
-                        'region': str(self.region),
-                        'type': 'trending',
-                        'timestamp': datetime.now().isoformat()
-                    }
-                })
+                    'metadata': metadata.copy()
+                }
+                for rank, keyword in self.rank_keywords(trending, limit)
+            ]
             
             self.logger.info(f"Returning {len(results)} results")
             return results
@@ -1,13 +1,38 @@
 from typing import List, Dict, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
+import os
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .base import KeywordsFetcher
+from ..cache import api_cache, api_cache_key, cached_execute
 from ..region import Region
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    """Process-wide session so TCP/TLS connections to the API are kept alive"""
+    session = requests.Session()
+    # Enough pooled connections for fetch_many's default worker count
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount('https://', adapter)
+    return session
+
 class YouTubeTrendingFetcher(KeywordsFetcher):
+    # Request parameters shared by every videos chart call
+    _BASE_PARAMS = {'part': 'snippet,statistics', 'chart': 'mostPopular'}
+    
     def __init__(self, region: str = "TW", api_key: Optional[str] = None):
         super().__init__(region)
-        self.api_key = api_key
+        self.api_key = api_key or os.getenv('YOUTUBE_API_KEY')
         self.base_url = "https://www.googleapis.com/youtube/v3"
     
     def fetch(self, limit: int = 10) -> List[Dict[str, any]]:
@@ -19,44 +44,147 @@ class YouTubeTrendingFetcher(KeywordsFetcher):
         try:
             # Get trending videos
             url = f"{self.base_url}/videos"
-            params = {
-                'part': 'snippet,statistics',
-                'chart': 'mostPopular',
-                'regionCode': self.region.get_youtube_code(),
-                'maxResults': limit,
-                'key': self.api_key
-            }
+            params = {**self._request_params(limit), 'key': self.api_key}
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = cached_execute('trending', url, params, lambda: self._get_json(url, params))
+            return self._build_results(data)
             
-            results = []
-            for rank, item in enumerate(data['items'], 1):
-                # Extract keywords from title and tags
-                keywords = set()
-                keywords.add(item['snippet']['title'])
-                keywords.update(item['snippet'].get('tags', []))
-                
-                results.append({
-                    'keyword': self.clean_keyword(item['snippet']['title']),
-                    'rank': rank,
-                    'score': int(item['statistics']['viewCount']),
-                    'metadata': {
-                        'platform': 'youtube',
-                        'region': self.region,
-                        'video_id': item['id'],
-                        'tags': list(keywords),
-                        'view_count': item['statistics']['viewCount'],
-                        'like_count': item['statistics'].get('likeCount', 0)
-                    }
-                })
+        except Exception as e:
+            self.logger.error("Failed to fetch YouTube trends: %s", e)
+            return []
+    
+    def _request_params(self, limit: int) -> Dict[str, any]:
+        """videos chart parameters for this region, without the API key"""
+        return {
+            **self._BASE_PARAMS,
+            'regionCode': self.region.get_youtube_code(),
+            'maxResults': limit,
+        }
+    
+    def _results_or_empty(self, data: Dict[str, any]) -> List[Dict[str, any]]:
+        """_build_results, logging a malformed response and returning [] like fetch()"""
+        try:
+            return self._build_results(data)
+        except Exception as e:
+            logger.error("Malformed YouTube trends response for %s: %s", self.region, e)
+            return []
+    
+    def _build_results(self, data: Dict[str, any]) -> List[Dict[str, any]]:
+        """Convert a videos chart response into fetch() results"""
+        results = []
+        clean_keyword = self.clean_keyword
+        for rank, item in enumerate(data['items'], 1):
+            snippet = item['snippet']
+            statistics = item['statistics']
+            title = snippet['title']
+            # Extract keywords from title and tags
+            keywords = {title, *snippet.get('tags', ())}
             
-            return results
+            results.append({
+                'keyword': clean_keyword(title),
+                'rank': rank,
+                'score': int(statistics['viewCount']),
+                'metadata': {
+                    'platform': 'youtube',
+                    'region': self.region,
+                    'video_id': item['id'],
+                    'tags': list(keywords),
+                    'view_count': statistics['viewCount'],
+                    'like_count': statistics.get('likeCount', 0)
+                }
+            })
+        
+        return results
+    
+    @staticmethod
+    def _get_json(url: str, params: Dict[str, any]) -> Dict[str, any]:
+        """GET a YouTube API endpoint and return the parsed JSON body"""
+        response = _session().get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return orjson.loads(response.content) if orjson is not None else response.json()
+    
+    @classmethod
+    def fetch_many(cls,
+                   regions: List[str],
+                   api_key: Optional[str] = None,
+                   limit: int = 10,
+                   max_workers: int = 8) -> Dict[str, List[Dict[str, any]]]:
+        """
+        Fetch trending keywords for several regions with one batch request
+        
+        Uncached regions go out as a single Google API batch HTTP request
+        (up to 50 calls each), and responses share the fetch() cache. If
+        the batch itself fails, the regions are fetched one request each
+        on a thread pool.
+        
+        Args:
+            regions: Region codes
+            api_key: YouTube Data API key (default: YOUTUBE_API_KEY environment variable)
+            limit: Maximum number of keywords per region
+            max_workers: Maximum number of concurrent requests for the fallback
             
+        Returns:
+            Dict of region code -> results of fetch()
+        """
+        regions = list(dict.fromkeys(regions))
+        if not regions:
+            return {}
+        # Resolved once so every fetcher and cache key uses the same key
+        api_key = api_key or os.getenv('YOUTUBE_API_KEY')
+        fetchers = {region: cls(region, api_key) for region in regions}
+        if not api_key:
+            return {region: fetcher.fetch(limit) for region, fetcher in fetchers.items()}
+        
+        cache = api_cache('trending')
+        url = f"{next(iter(fetchers.values())).base_url}/videos"
+        keys = {
+            region: api_cache_key(url, {**fetcher._request_params(limit), 'key': api_key})
+            for region, fetcher in fetchers.items()
+        }
+        responses = {}
+        for region, key in keys.items():
+            cached = cache.get(key)
+            if cached is not None:
+                responses[region] = cached
+        
+        missing = [region for region in regions if region not in responses]
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Failed to fetch YouTube trends for %s: %s", request_id, exception)
+            else:
+                responses[request_id] = response
+                cache.set(keys[request_id], response)
+        
+        try:
+            if missing:
+                # Imported here so fetch() alone does not load googleapiclient
+                from ..youtube.yt_search import youtube_client
+                youtube = youtube_client(api_key)
+                # A batch request holds at most 50 calls
+                for start in range(0, len(missing), 50):
+                    batch = youtube.new_batch_http_request(callback=on_response)
+                    for region in missing[start:start + 50]:
+                        batch.add(youtube.videos().list(**fetchers[region]._request_params(limit)), request_id=region)
+                    batch.execute()
         except Exception as e:
-            self.logger.error(f"Failed to fetch YouTube trends: {str(e)}")
-            return []
+            # Batch transport failed: fall back to concurrent single requests
+            pending = [region for region in missing if region not in responses]
+            if not pending:
+                logger.warning("Batch request failed after every region was fetched: %s", e)
+                return {region: fetchers[region]._results_or_empty(responses[region]) for region in regions}
+            logger.warning("Batch request failed, fetching regions one by one: %s", e)
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+                fallback = dict(zip(pending, pool.map(lambda region: fetchers[region].fetch(limit), pending)))
+            return {
+                region: fallback[region] if region in fallback else fetchers[region]._results_or_empty(responses[region])
+                for region in regions
+            }
+        
+        return {
+            region: fetchers[region]._results_or_empty(responses[region]) if region in responses else []
+            for region in regions
+        }
     
     def fetch_with_time(self, 
                        start_time: datetime,
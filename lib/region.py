@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Dict, ClassVar
 
 class Region(Enum):
@@ -23,27 +24,33 @@ class Region(Enum):
         Get Region enum from region code
         
         Args:
-            code: Region code string (e.g., 'TW', 'US')
+            code: Region code string (e.g., 'TW', 'US'), any case
             
         Returns:
             Region enum if found, None otherwise
         """
+        # Normalized first so 'tw', 'TW' and ' TW' share one cache entry
+        return cls._from_canonical_code(code.strip().upper())
+    
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _from_canonical_code(cls, code: str) -> Optional['Region']:
         try:
-            return cls(code.upper())
+            return cls(code)
         except ValueError:
             return None
     
     def get_twitter_woeid(self) -> int:
         """Get Twitter WOEID for this region"""
-        return _TWITTER_WOEID.get(self.value, _TWITTER_WOEID["GLOBAL"])
+        return self._twitter_woeid
     
     def get_google_code(self) -> str:
         """Get Google Trends region code"""
-        return _GOOGLE_TRENDS_CODE.get(self.value, _GOOGLE_TRENDS_CODE["GLOBAL"])
+        return self._google_code
     
     def get_youtube_code(self) -> Optional[str]:
         """Get YouTube region code"""
-        return _YOUTUBE_REGION_CODE.get(self.value, _YOUTUBE_REGION_CODE["GLOBAL"])
+        return self._youtube_code
     
     @classmethod
     def get_supported_regions(cls) -> Dict[str, 'Region']:
@@ -53,12 +60,12 @@ class Region(Enum):
         Returns:
             Dictionary of region codes to Region enums
         """
-        return {region.value: region for region in cls}
+        return dict(_SUPPORTED_REGIONS)
     
     @classmethod
     def is_valid_code(cls, code: str) -> bool:
         """Check if a region code is valid"""
-        return code.upper() in [region.value for region in cls]
+        return code.upper() in _VALID_CODES
 
 # Platform-specific region mappings defined outside the class
 _TWITTER_WOEID: Dict[str, int] = {
@@ -90,3 +97,13 @@ _YOUTUBE_REGION_CODE: Dict[str, Optional[str]] = {
     "SG": "SG",
     "GLOBAL": None  # YouTube API uses None for global
 }
+
+# Precomputed lookups: valid codes, and each member's platform codes as attributes
+_SUPPORTED_REGIONS: Dict[str, Region] = {region.value: region for region in Region}
+_VALID_CODES = frozenset(_SUPPORTED_REGIONS)
+
+for _region in Region:
+    _region._twitter_woeid = _TWITTER_WOEID.get(_region.value, _TWITTER_WOEID["GLOBAL"])
+    _region._google_code = _GOOGLE_TRENDS_CODE.get(_region.value, _GOOGLE_TRENDS_CODE["GLOBAL"])
+    _region._youtube_code = _YOUTUBE_REGION_CODE.get(_region.value, _YOUTUBE_REGION_CODE["GLOBAL"])
+del _region
@@ -1,28 +1,67 @@
 from pathlib import Path
 import logging
-import speech_recognition as sr
+import threading
+from typing import Dict, Tuple
 
 class Transcriber:
-    """Audio transcription using speech recognition"""
-    
-    def __init__(self):
+    """Audio transcription using a local faster-whisper model"""
+
+    # Loaded models shared by all instances, keyed by the requested (model_size, device, compute_type)
+    _models: Dict[Tuple[str, str, str], object] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_size: str = "small", device: str = "auto", compute_type: str = "auto"):
+        """
+        Args:
+            model_size: Whisper model size or path to a converted model
+            device: 'auto', 'cpu' or 'cuda'
+            compute_type: CTranslate2 compute type; 'auto' picks int8_float16
+                on CUDA and int8 on CPU
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.recognizer = sr.Recognizer()
-    
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+
+    @staticmethod
+    def _resolve(device: str, compute_type: str) -> Tuple[str, str]:
+        """Resolve 'auto' device and compute type to the values passed to WhisperModel"""
+        if device == "auto":
+            import ctranslate2
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        if compute_type == "auto":
+            # int8 weights everywhere; CUDA keeps fp16 activations for the tensor cores
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+        return device, compute_type
+
+    @property
+    def model(self):
+        """The WhisperModel for this configuration, loaded on first use"""
+        key = (self.model_size, self.device, self.compute_type)
+        model = self._models.get(key)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(key)
+                if model is None:
+                    from faster_whisper import WhisperModel
+                    device, compute_type = self._resolve(self.device, self.compute_type)
+                    self.logger.info(f"Loading whisper model {self.model_size} ({device}, {compute_type})")
+                    model = WhisperModel(self.model_size, device=device, compute_type=compute_type)
+                    self._models[key] = model
+        return model
+
     def transcribe(self, audio_path: Path) -> str:
         """Transcribe audio file to text
-        
+
         Args:
             audio_path: Path to audio file
-            
+
         Returns:
             Transcribed text
         """
         try:
-            with sr.AudioFile(str(audio_path)) as source:
-                audio = self.recognizer.record(source)
-                text = self.recognizer.recognize_google(audio)
-                return text
+            segments, _ = self.model.transcribe(str(audio_path), beam_size=1, vad_filter=True)
+            return " ".join(segment.text.strip() for segment in segments)
         except Exception as e:
             self.logger.error(f"Error transcribing audio: {e}")
-            raise 
\ No newline at end of file
+            raise
@@ -1,12 +1,37 @@
 import yt_dlp
 import os
-from typing import Dict, Optional
-from urllib.parse import parse_qs, urlparse
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
+from typing import Any, Dict, List, Optional, Union
+from util.config import load_config
 from ..ffmpeg.extractor import FFmpegExtractor
 
+# youtu.be/<id>, youtube.com/watch?...v=<id>, youtube.com/embed/<id>, youtube.com/v/<id>
+_VIDEO_ID_RE = re.compile(
+    r'^(?:https?://)?(?:www\.)?'
+    r'(?:youtu\.be/|youtube\.com/(?:watch\?(?:[^#]*&)?v=|embed/|v/))'
+    r'([\w-]{11})'
+)
+
+# Download slots per host, shared by every YouTubeDownloader in the process
+_HOST_SLOTS: Dict[str, threading.BoundedSemaphore] = {}
+_HOST_LOCK = threading.Lock()
+
+# Extensions yt-dlp writes subtitles with
+_SUBTITLE_EXTENSIONS = frozenset({'vtt', 'srt', 'ass', 'ssa', 'ttml', 'srv1', 'srv2', 'srv3', 'json3', 'lrc'})
+
 class YouTubeDownloader:
-    def __init__(self, config):
-        
+    def __init__(self, config: Union[Dict[str, Any], str, os.PathLike]):
+        """
+        Args:
+            config: Parsed config dict, or path to a YAML config file
+        """
+        if not isinstance(config, dict):
+            config = load_config(config)
         yt_config = config['youtube_downloader']
         
         self.output_dir = yt_config['output_dir']
@@ -20,35 +45,91 @@ class YouTubeDownloader:
             'writesubtitles': yt_config['subtitles']['enabled'],
             'writeautomaticsub': yt_config['subtitles']['auto_generate'],
             'subtitleslangs': yt_config['subtitles']['languages'],
+            # Merged video+audio formats are remuxed into mp4 without re-encoding,
+            # which also keeps the <id>.mp4 path below valid
+            'merge_output_format': 'mp4',
         }
         
+        # Segmented downloads through aria2c, only when enabled and installed
+        downloader_config = yt_config.get('downloader', {})
+        self.max_workers = downloader_config.get('max_workers', 4)
+        # Concurrent downloads per host across every downloader in the process,
+        # to stay clear of HTTP 429; below max_workers so it actually binds
+        self.per_host = downloader_config.get('per_host', max(1, self.max_workers // 2))
+        if downloader_config.get('aria2c', False) and shutil.which('aria2c'):
+            connections = str(downloader_config.get('connections', 16))
+            self.ydl_opts['external_downloader'] = {'default': 'aria2c'}
+            self.ydl_opts['external_downloader_args'] = {
+                'aria2c': ['-x', connections, '-s', connections, '-k', '1M', '--file-allocation=none']
+            }
+        
         # Only add postprocessors if enabled
         if yt_config['video']['postprocess']['enabled']:
             self.ydl_opts['postprocessors'] = [{
                 'key': 'FFmpegVideoConvertor',
                 'preferedformat': 'mp4'
             }]
-            self.ydl_opts['postprocessor_args'] = [
-                '-vf', yt_config['video']['postprocess']['video_scale'],
-                '-b:v', yt_config['video']['postprocess']['video_bitrate'],
-                '-b:a', yt_config['video']['postprocess']['audio_bitrate'],
-            ]
+            # Scoped to the convertor so the merger keeps stream-copying
+            self.ydl_opts['postprocessor_args'] = {
+                'videoconvertor': [
+                    '-vf', yt_config['video']['postprocess']['video_scale'],
+                    '-b:v', yt_config['video']['postprocess']['video_bitrate'],
+                    '-b:a', yt_config['video']['postprocess']['audio_bitrate'],
+                ]
+            }
         
         self.ffmpeg = FFmpegExtractor()
+        # Runs audio extraction alongside yt-dlp's post-download work (threads start on demand)
+        self._extract_pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="extract_audio"
+        )
+    
+    def close(self) -> None:
+        """Wait for pending audio extractions and stop the extraction threads"""
+        self._extract_pool.shutdown(wait=True)
+    
+    def __enter__(self) -> "YouTubeDownloader":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def extract_video_id(url: str) -> str:
         """Extract video ID from YouTube URL"""
-        # Handle different URL formats
-        parsed_url = urlparse(url)
-        if parsed_url.hostname in ('youtu.be', 'www.youtu.be'):
-            return parsed_url.path[1:]
-        if parsed_url.hostname in ('youtube.com', 'www.youtube.com'):
-            if parsed_url.path == '/watch':
-                return parse_qs(parsed_url.query)['v'][0]
-            elif parsed_url.path.startswith(('/embed/', '/v/')):
-                return parsed_url.path.split('/')[2]
-        raise ValueError(f"Could not extract video ID from URL: {url}")
+        match = _VIDEO_ID_RE.match(url)
+        if not match:
+            raise ValueError(f"Could not extract video ID from URL: {url}")
+        return match.group(1)
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent downloads from the URL's host
+        
+        Shared by every downloader in the process; the first downloader to
+        use a host sets its limit.
+        """
+        host = urlsplit(url if '//' in url else f'//{url}').netloc.lower().removeprefix('www.')
+        slot = _HOST_SLOTS.get(host)
+        if slot is None:
+            with _HOST_LOCK:
+                slot = _HOST_SLOTS.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        return slot
+    
+    @staticmethod
+    def _is_media_download(d: Dict[str, Any]) -> bool:
+        """Whether a progress hook event is for a complete single-file media download
+        
+        Subtitles are written first through the same hooks; their info dict
+        is the subtitle entry, which has no format_id. Merged formats finish
+        once per stream, and only a single file is safe to read.
+        """
+        info = d.get('info_dict') or {}
+        filename = d.get('filename', '')
+        return ('format_id' in info
+                and not info.get('requested_formats')
+                and os.path.splitext(filename)[1].lstrip('.').lower() not in _SUBTITLE_EXTENSIONS)
     
     def download_video(self, url: str, extract_audio: bool = False) -> Dict[str, str]:
         """
@@ -64,37 +145,98 @@ class YouTubeDownloader:
         try:
             video_id = self.extract_video_id(url)
             
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            # Start extracting as soon as the file lands; postprocessors rewrite it afterwards
+            ydl_opts = self.ydl_opts
+            audio_futures = []
+            if extract_audio and not ydl_opts.get('postprocessors'):
+                def on_progress(d):
+                    if d['status'] == 'finished' and not audio_futures and self._is_media_download(d):
+                        audio_futures.append(self._extract_pool.submit(
+                            self.ffmpeg.extract_audio, d['filename']
+                        ))
+                ydl_opts = {**ydl_opts, 'progress_hooks': [on_progress]}
+            
+            # The host slot only covers the HTTP work; audio extraction runs after it is released
+            with self._host_slot(url), yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=True)
-                video_path = os.path.join(self.output_dir, f"{video_id}.mp4")
-                
-                # Get subtitle paths if available
-                subtitles = {}
-                if info.get('requested_subtitles'):
-                    for lang, sub_info in info['requested_subtitles'].items():
-                        sub_path = os.path.join(self.output_dir, f"{video_id}.{lang}.vtt")
-                        if os.path.exists(sub_path):
-                            subtitles[lang] = sub_path
-                
-                result = {
-                    'video': video_path,
-                    'subtitles': subtitles,
-                    'title': info.get('title', ''),
-                    'duration': info.get('duration', 0),
-                    'description': info.get('description', ''),
-                    'id': video_id
-                }
-                
-                # Extract audio if requested
-                if extract_audio:
+            video_path = os.path.join(self.output_dir, f"{video_id}.mp4")
+            
+            # Get subtitle paths if available
+            subtitles = {}
+            if info.get('requested_subtitles'):
+                for lang, sub_info in info['requested_subtitles'].items():
+                    sub_path = os.path.join(self.output_dir, f"{video_id}.{lang}.vtt")
+                    if os.path.exists(sub_path):
+                        subtitles[lang] = sub_path
+            
+            result = {
+                'video': video_path,
+                'subtitles': subtitles,
+                'title': info.get('title', ''),
+                'duration': info.get('duration', 0),
+                'description': info.get('description', ''),
+                'id': video_id
+            }
+            
+            # Extract audio if requested
+            if extract_audio:
+                if audio_futures:
+                    audio_result = audio_futures[0].result()
+                else:
                     audio_result = self.ffmpeg.extract_audio(video_path)
-                    result['audio'] = audio_result['audio']
-                
-                return result
+                result['audio'] = audio_result['audio']
+            
+            return result
                 
         except Exception as e:
             raise Exception(f"Failed to download video: {str(e)}")
     
+    def download_many(self,
+                      urls: List[str],
+                      extract_audio: bool = False,
+                      max_workers: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Download several YouTube videos concurrently
+        
+        Args:
+            urls: YouTube video URLs
+            extract_audio: Whether to extract audio from each video
+            max_workers: Concurrent downloads (default: downloader.max_workers
+                from config, 4 if unset); keep it low to avoid HTTP 429
+            
+        Returns:
+            List of download_video results in input order; failed downloads
+            are returned as {'url': ..., 'error': ...}. URLs of the same
+            video are downloaded once and each position gets its own copy
+            of the result.
+        """
+        if not urls:
+            return []
+        
+        # Copies of one video would race on the same output and .part files
+        unique: Dict[str, str] = {}
+        for url in urls:
+            unique.setdefault(self._video_key(url), url)
+        
+        def download(url: str) -> Dict[str, str]:
+            try:
+                return self.download_video(url, extract_audio)
+            except Exception as e:
+                return {'url': url, 'error': str(e)}
+        
+        workers = min(max_workers or self.max_workers, len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = dict(zip(unique, pool.map(download, unique.values())))
+        return [dict(results[self._video_key(url)]) for url in urls]
+    
+    @classmethod
+    def _video_key(cls, url: str) -> str:
+        """Video ID of a URL, or the URL itself when it has none (download_video reports the error)"""
+        try:
+            return cls.extract_video_id(url)
+        except ValueError:
+            return url
+    
     def download_captions(self, url: str) -> Dict[str, str]:
         """
         Download available captions for a YouTube video
@@ -1,15 +1,62 @@
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 import os
 from pathlib import Path
 import logging
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+from ..cache import api_cache, api_cache_key, cached_execute
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that parses API responses with orjson"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+# Video thumbnail sizes, best first
+_QUALITY_ORDER = ('maxres', 'standard', 'high', 'medium', 'default')
+# Channel thumbnail sizes, best first
+_CHANNEL_QUALITY_ORDER = ('high', 'medium', 'default')
+
+@lru_cache(maxsize=4)
+def youtube_client(api_key: str):
+    """Return a YouTube Data API client for api_key, built once per process
+    
+    Uses the discovery document shipped with googleapiclient, so building
+    needs no HTTP fetch and no discovery file cache, and parses responses
+    with orjson when it is installed. The client is not thread-safe;
+    share it within one thread.
+    """
+    model = _OrjsonModel() if orjson is not None else None
+    return build('youtube', 'v3', developerKey=api_key, cache_discovery=False,
+                 static_discovery=True, model=model)
 
 class YouTubeSearcher:
     """YouTube search functionality using YouTube Data API"""
     
+    # Static parts of the search().list parameters
+    _VIDEO_SEARCH_PARAMS = {
+        'part': 'id,snippet',
+        'type': 'video',
+        'fields': 'nextPageToken,items(id(videoId),snippet(title,description,publishedAt,channelId,channelTitle,thumbnails))'
+    }
+    _CHANNEL_SEARCH_PARAMS = {'part': 'id,snippet', 'type': 'channel'}
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize YouTube API client
         
@@ -28,7 +75,155 @@ class YouTubeSearcher:
         if not self.api_key:
             raise ValueError("YouTube API key is required. Set YOUTUBE_API_KEY environment variable or pass to constructor.")
         
-        self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+        self.youtube = youtube_client(self.api_key)
+    
+    def _video_search_params(self,
+                             query: str,
+                             max_results: int = 10,
+                             published_after: Optional[datetime] = None,
+                             region_code: Optional[str] = None,
+                             relevance_language: Optional[str] = None,
+                             video_duration: Optional[str] = None) -> Dict:
+        """Build search().list parameters for a video search"""
+        search_params = {
+            **self._VIDEO_SEARCH_PARAMS,
+            'q': query,
+            'maxResults': min(max_results, 50),
+        }
+        
+        # Add optional filters
+        if published_after:
+            # Floor to the day so "now - N days" gives the same request (and cache key) all day
+            day = published_after.replace(hour=0, minute=0, second=0, microsecond=0)
+            formatted_time = day.strftime('%Y-%m-%dT%H:%M:%SZ')
+            search_params['publishedAfter'] = formatted_time
+        if region_code:
+            search_params['regionCode'] = region_code
+        if relevance_language:
+            search_params['relevanceLanguage'] = relevance_language
+        if video_duration:
+            search_params['videoDuration'] = video_duration
+        return search_params
+    
+    def _fetch_video_details(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Get videos().list items for the given IDs, 50 IDs per request
+        
+        Returns:
+            Dict of video ID -> API item
+        """
+        details = {}
+        for start in range(0, len(video_ids), 50):
+            videos_params = {
+                'part': 'snippet,statistics,contentDetails',
+                'id': ','.join(video_ids[start:start + 50])
+            }
+            videos_response = cached_execute(
+                'search', 'videos.list', videos_params,
+                lambda: self.youtube.videos().list(**videos_params).execute()
+            )
+            for item in videos_response.get('items', []):
+                details[item['id']] = item
+        return details
+    
+    def _build_video(self, item: Dict) -> Optional[Dict]:
+        """Convert one videos().list item into a video details dictionary
+        
+        Returns:
+            Video details, or None if the item is missing required fields
+        """
+        try:
+            video_id = item['id']
+            sn = item['snippet']
+            st = item['statistics']
+            # Get video thumbnail (highest quality available)
+            thumbnails = sn.get('thumbnails', {})
+            thumbnail = next((thumbnails[q] for q in _QUALITY_ORDER if q in thumbnails), None)
+            thumbnail_url = thumbnail['url'] if thumbnail else None
+            
+            return {
+                'video_id': video_id,
+                'title': sn['title'],
+                'description': sn['description'],
+                'channel_id': sn['channelId'],
+                'channel_title': sn['channelTitle'],
+                'published_at': sn['publishedAt'],
+                'view_count': int(st.get('viewCount', 0)),
+                'like_count': int(st.get('likeCount', 0)),
+                'comment_count': int(st.get('commentCount', 0)),
+                'duration': item['contentDetails']['duration'],
+                'tags': sn.get('tags', []),
+                'url': f"https://www.youtube.com/watch?v={video_id}",
+                'thumbnail_url': thumbnail_url,
+                # Add thumbnail details
+                'thumbnail': {
+                    'url': thumbnail_url,
+                    'width': thumbnail.get('width'),
+                    'height': thumbnail.get('height')
+                } if thumbnail else None
+            }
+        except (KeyError, ValueError) as e:
+            self.logger.warning(f"Error processing video {item.get('id')}: {e}")
+            return None
+    
+    def _format_videos(self, items: List[Dict]) -> List[Dict]:
+        """Convert videos().list items into video details dictionaries, skipping malformed ones"""
+        return [video for video in map(self._build_video, items) if video is not None]
+    
+    def _search_pages(self, search_params: Dict, limit: int) -> Iterator[List[Dict]]:
+        """Yield search().list result items page by page, up to limit items
+        
+        Each page is requested only when the previous one has been consumed.
+        """
+        params = dict(search_params)
+        remaining = limit
+        while remaining > 0:
+            params['maxResults'] = min(remaining, 50)
+            page_params = dict(params)
+            search_response = cached_execute(
+                'search', 'search.list', page_params,
+                lambda: self.youtube.search().list(**page_params).execute()
+            )
+            items = search_response.get('items', [])[:remaining]
+            if not items:
+                return
+            yield items
+            remaining -= len(items)
+            params['pageToken'] = search_response.get('nextPageToken')
+            if not params['pageToken']:
+                return
+    
+    def search_iter(self, 
+                    query: str,
+                    max_results: int = 10,
+                    published_after: Optional[datetime] = None,
+                    region_code: Optional[str] = None,
+                    relevance_language: Optional[str] = None,
+                    video_duration: Optional[str] = None) -> Iterator[Dict]:
+        """Lazily search YouTube videos, following nextPageToken beyond 50 results
+        
+        Same arguments as search(). Pages (and their video details) are fetched
+        only as the caller iterates, so stopping early saves requests.
+        
+        Yields:
+            Video details dictionaries in search relevance order
+        """
+        # Build search request
+        search_params = self._video_search_params(
+            query, max_results, published_after,
+            region_code, relevance_language, video_duration
+        )
+        
+        self.logger.debug("Searching with params: %s", search_params)
+        
+        for items in self._search_pages(search_params, max_results):
+            # Get detailed video information for this page
+            video_ids = [item['id']['videoId'] for item in items]
+            details = self._fetch_video_details(video_ids)
+            for vid in video_ids:
+                if vid in details:
+                    video = self._build_video(details[vid])
+                    if video is not None:
+                        yield video
     
     def search(self, 
               query: str,
@@ -51,83 +246,93 @@ class YouTubeSearcher:
             List of video details dictionaries
         """
         try:
-            # Build search request
-            search_params = {
-                'q': query,
-                'part': 'id,snippet',
-                'type': 'video',
-                'maxResults': min(max_results, 50),
-                'fields': 'items(id(videoId),snippet(title,description,publishedAt,channelId,channelTitle,thumbnails))'
-            }
-            
-            # Add optional filters
-            if published_after:
-                formatted_time = published_after.strftime('%Y-%m-%dT%H:%M:%SZ')
-                search_params['publishedAfter'] = formatted_time
-            if region_code:
-                search_params['regionCode'] = region_code
-            if relevance_language:
-                search_params['relevanceLanguage'] = relevance_language
-            if video_duration:
-                search_params['videoDuration'] = video_duration
+            results = list(islice(self.search_iter(
+                query, max_results, published_after,
+                region_code, relevance_language, video_duration
+            ), max_results))
             
-            self.logger.debug(f"Searching with params: {search_params}")
+            if not results:
+                self.logger.warning("No videos found")
+            else:
+                self.logger.info(f"Found {len(results)} videos")
+            return results
             
-            # Execute search request
-            search_response = self.youtube.search().list(**search_params).execute()
+        except HttpError as e:
+            self.logger.error(f"YouTube API error: {e.resp.status} {e.content}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error searching YouTube: {e}")
+            raise
+    
+    def search_many(self,
+                    queries: List[str],
+                    max_results: int = 10,
+                    published_after: Optional[datetime] = None,
+                    region_code: Optional[str] = None,
+                    relevance_language: Optional[str] = None,
+                    video_duration: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """Search YouTube videos for several queries with batched requests
+        
+        Uncached searches go out in one batch HTTP request, then the details
+        of every found video are fetched with shared videos().list calls
+        (50 IDs each) instead of one per query.
+        
+        Args:
+            queries: Search query strings
+            Other arguments are the same as search()
+        
+        Returns:
+            Dict of query -> list of video details dictionaries (same shape as search())
+        """
+        try:
+            params_by_query = {
+                query: self._video_search_params(
+                    query, max_results, published_after,
+                    region_code, relevance_language, video_duration
+                )
+                for query in dict.fromkeys(queries)
+            }
             
-            if not search_response.get('items'):
-                self.logger.warning("No videos found")
-                return []
+            # Serve what we can from the cache, batch the rest
+            cache = api_cache('search')
+            responses = {}
+            for query, params in params_by_query.items():
+                cached = cache.get(api_cache_key('search.list', params))
+                if cached is not None:
+                    responses[query] = cached
             
-            # Get video IDs for detailed info
-            video_ids = [item['id']['videoId'] for item in search_response['items']]
+            missing = [query for query in params_by_query if query not in responses]
+            for start in range(0, len(missing), 50):
+                errors = {}
+                
+                def on_response(request_id, response, exception):
+                    if exception is not None:
+                        errors[request_id] = exception
+                    else:
+                        responses[request_id] = response
+                        cache.set(api_cache_key('search.list', params_by_query[request_id]), response)
+                
+                batch = self.youtube.new_batch_http_request(callback=on_response)
+                for query in missing[start:start + 50]:
+                    batch.add(self.youtube.search().list(**params_by_query[query]), request_id=query)
+                batch.execute()
+                for query, exception in errors.items():
+                    self.logger.warning(f"Search failed for '{query}': {exception}")
             
-            # Get detailed video information
-            videos_response = self.youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=','.join(video_ids)
-            ).execute()
+            # One set of videos().list calls for every query's results
+            ids_by_query = {
+                query: [item['id']['videoId'] for item in response.get('items', [])]
+                for query, response in responses.items()
+            }
+            all_ids = list(dict.fromkeys(vid for ids in ids_by_query.values() for vid in ids))
+            details = self._fetch_video_details(all_ids)
             
-            # Process and format results
-            results = []
-            for item in videos_response.get('items', []):
-                try:
-                    # Get video thumbnail URL (default to highest quality available)
-                    thumbnails = item['snippet'].get('thumbnails', {})
-                    thumbnail_url = None
-                    for quality in ['maxres', 'standard', 'high', 'medium', 'default']:
-                        if quality in thumbnails:
-                            thumbnail_url = thumbnails[quality]['url']
-                            break
-                    
-                    video_data = {
-                        'video_id': item['id'],
-                        'title': item['snippet']['title'],
-                        'description': item['snippet']['description'],
-                        'channel_id': item['snippet']['channelId'],
-                        'channel_title': item['snippet']['channelTitle'],
-                        'published_at': item['snippet']['publishedAt'],
-                        'view_count': int(item['statistics'].get('viewCount', 0)),
-                        'like_count': int(item['statistics'].get('likeCount', 0)),
-                        'comment_count': int(item['statistics'].get('commentCount', 0)),
-                        'duration': item['contentDetails']['duration'],
-                        'tags': item['snippet'].get('tags', []),
-                        'url': f"https://www.youtube.com/watch?v={item['id']}",
-                        'thumbnail_url': thumbnail_url,
-                        # Add thumbnail details
-                        'thumbnail': {
-                            'url': thumbnail_url,
-                            'width': thumbnails.get(quality, {}).get('width'),
-                            'height': thumbnails.get(quality, {}).get('height')
-                        } if thumbnail_url else None
-                    }
-                    results.append(video_data)
-                except (KeyError, ValueError) as e:
-                    self.logger.warning(f"Error processing video {item.get('id')}: {e}")
-                    continue
+            results = {}
+            for query in params_by_query:
+                items = [details[vid] for vid in ids_by_query.get(query, []) if vid in details]
+                results[query] = self._format_videos(items)
             
-            self.logger.info(f"Found {len(results)} videos")
+            self.logger.info(f"Found {sum(map(len, results.values()))} videos for {len(results)} queries")
             return results
             
         except HttpError as e:
@@ -137,6 +342,71 @@ class YouTubeSearcher:
             self.logger.error(f"Error searching YouTube: {e}")
             raise
     
+    def _build_channel(self, item: Dict) -> Optional[Dict]:
+        """Convert one channels().list item into a channel details dictionary
+        
+        Returns:
+            Channel details, or None if the item is missing required fields
+        """
+        try:
+            channel_id = item['id']
+            sn = item['snippet']
+            st = item['statistics']
+            # Get the best quality thumbnail URL
+            thumbnails = sn.get('thumbnails', {})
+            thumbnail = next((thumbnails[q] for q in _CHANNEL_QUALITY_ORDER if q in thumbnails), None)
+            
+            return {
+                'channel_id': channel_id,
+                'title': sn['title'],
+                'description': sn['description'],
+                'subscriber_count': int(st.get('subscriberCount', 0)),
+                'video_count': int(st.get('videoCount', 0)),
+                'view_count': int(st.get('viewCount', 0)),
+                'url': f"https://www.youtube.com/channel/{channel_id}",
+                'thumbnail_url': thumbnail['url'] if thumbnail else None
+            }
+        except (KeyError, ValueError) as e:
+            self.logger.warning(f"Error processing channel {item.get('id')}: {e}")
+            return None
+    
+    def search_channels_iter(self,
+                             query: str,
+                             max_results: int = 10,
+                             region_code: Optional[str] = None) -> Iterator[Dict]:
+        """Lazily search YouTube channels, following nextPageToken beyond 50 results
+        
+        Same arguments as search_channels().
+        
+        Yields:
+            Channel details dictionaries in search relevance order
+        """
+        # Build search request
+        search_params = {**self._CHANNEL_SEARCH_PARAMS, 'q': query}
+        
+        if region_code:
+            search_params['regionCode'] = region_code
+        
+        self.logger.debug("Searching channels with params: %s", search_params)
+        
+        for items in self._search_pages(search_params, max_results):
+            # Get detailed channel information for this page
+            channel_ids = [item['id']['channelId'] for item in items]
+            channels_params = {
+                'part': 'snippet,statistics',
+                'id': ','.join(channel_ids)
+            }
+            channels_response = cached_execute(
+                'channels', 'channels.list', channels_params,
+                lambda: self.youtube.channels().list(**channels_params).execute()
+            )
+            details = {item['id']: item for item in channels_response.get('items', [])}
+            for cid in channel_ids:
+                if cid in details:
+                    channel = self._build_channel(details[cid])
+                    if channel is not None:
+                        yield channel
+    
     def search_channels(self,
                        query: str,
                        max_results: int = 10,
@@ -152,63 +422,12 @@ class YouTubeSearcher:
             List of channel details dictionaries
         """
         try:
-            # Build search request
-            search_params = {
-                'q': query,
-                'part': 'id,snippet',
-                'type': 'channel',
-                'maxResults': min(max_results, 50)
-            }
-            
-            if region_code:
-                search_params['regionCode'] = region_code
-            
-            self.logger.debug(f"Searching channels with params: {search_params}")
-            
-            # Execute search
-            search_response = self.youtube.search().list(**search_params).execute()
+            results = list(islice(self.search_channels_iter(query, max_results, region_code), max_results))
             
-            if not search_response.get('items'):
+            if not results:
                 self.logger.warning("No channels found")
-                return []
-            
-            # Get channel IDs
-            channel_ids = [item['id']['channelId'] for item in search_response['items']]
-            
-            # Get detailed channel information
-            channels_response = self.youtube.channels().list(
-                part='snippet,statistics',
-                id=','.join(channel_ids)
-            ).execute()
-            
-            # Process results
-            results = []
-            for item in channels_response.get('items', []):
-                try:
-                    # Get the best quality thumbnail URL
-                    thumbnails = item['snippet'].get('thumbnails', {})
-                    thumbnail_url = None
-                    for quality in ['high', 'medium', 'default']:
-                        if quality in thumbnails:
-                            thumbnail_url = thumbnails[quality]['url']
-                            break
-                    
-                    channel_data = {
-                        'channel_id': item['id'],
-                        'title': item['snippet']['title'],
-                        'description': item['snippet']['description'],
-                        'subscriber_count': int(item['statistics'].get('subscriberCount', 0)),
-                        'video_count': int(item['statistics'].get('videoCount', 0)),
-                        'view_count': int(item['statistics'].get('viewCount', 0)),
-                        'url': f"https://www.youtube.com/channel/{item['id']}",
-                        'thumbnail_url': thumbnail_url
-                    }
-                    results.append(channel_data)
-                except (KeyError, ValueError) as e:
-                    self.logger.warning(f"Error processing channel {item.get('id')}: {e}")
-                    continue
-            
-            self.logger.info(f"Found {len(results)} channels")
+            else:
+                self.logger.info(f"Found {len(results)} channels")
             return results
             
         except HttpError as e:
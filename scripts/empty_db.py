@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+import argparse
 import logging
 from pathlib import Path
 import sys
@@ -7,6 +7,8 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from db.client import get_client
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -14,23 +16,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def empty_mongodb():
-    """Empty all collections in the database"""
+def empty_mongodb(drop_database: bool = False, keep_collections: bool = False):
+    """Empty all collections in the database
+
+    Args:
+        drop_database: Drop the whole database in one call
+        keep_collections: Delete documents but keep collections, validators and indexes
+    """
     try:
         # Connect to MongoDB
-        client = MongoClient('mongodb://localhost:27017/')
+        client = get_client()
         db = client['yt_digest']
         logger.info("Connected to MongoDB")
 
-        # Get all collections
-        collections = db.list_collection_names()
-        
-        # Empty each collection
-        for collection_name in collections:
-            collection = db[collection_name]
-            result = collection.delete_many({})
-            logger.info(f"Deleted {result.deleted_count} documents from {collection_name}")
+        if drop_database:
+            client.drop_database('yt_digest')
+            logger.info("Dropped database yt_digest")
+        else:
+            # Get all collections
+            collections = db.list_collection_names()
 
+            # Dropping is a metadata operation; delete_many removes documents one by one
+            for collection_name in collections:
+                if keep_collections:
+                    result = db[collection_name].delete_many({})
+                    logger.info(f"Deleted {result.deleted_count} documents from {collection_name}")
+                else:
+                    db.drop_collection(collection_name)
+                    logger.info(f"Dropped collection {collection_name}")
+
+        if drop_database or not keep_collections:
+            logger.info("Run scripts/init_db.py to recreate collection validators")
         logger.info("Database emptied successfully")
         return True
 
@@ -45,9 +61,17 @@ def confirm_empty():
 
 def main():
     """Main function to empty the database"""
+    parser = argparse.ArgumentParser(description='Empty the yt_digest database')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--drop-database', action='store_true',
+                       help='Drop the whole database instead of each collection')
+    group.add_argument('--keep-collections', action='store_true',
+                       help='Delete documents only, keeping validators and indexes')
+    args = parser.parse_args()
+
     try:
         if confirm_empty():
-            empty_mongodb()
+            empty_mongodb(drop_database=args.drop_database, keep_collections=args.keep_collections)
             logger.info("Database emptying completed")
         else:
             logger.info("Operation cancelled by user")
@@ -1,13 +1,21 @@
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+from bson import json_util
+import json
+import argparse
+import io
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from datetime import datetime
 from pathlib import Path
 import sys
-from typing import Dict
+from typing import Dict, List
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from db.client import get_client
+from db.schemas import SCHEMAS
 from db.keywords import KeywordsDB
 from db.videos import VideosDB
 from db.transcripts import TranscriptsDB
@@ -20,11 +28,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def init_mongodb():
-    """Initialize MongoDB collections and indexes"""
+def _schema_hash(schema: dict) -> int:
+    """Order-independent hash of a $jsonSchema document"""
+    return hash(json.dumps(schema, sort_keys=True, default=str))
+
+# Only validate inserts and updates of documents that already pass, so
+# reseeding over legacy documents is not blocked
+VALIDATION_LEVEL = 'moderate'
+
+def apply_validators(db, validation_action: str = 'error') -> None:
+    """
+    Run collMod only for collections whose stored validator or settings differ
+    
+    Args:
+        db: Database to configure
+        validation_action: 'error' rejects invalid documents; 'warn' only logs
+            them server-side (for tests and local development)
+    """
+    current = {}
+    for info in db.command('listCollections', filter={'name': {'$in': list(SCHEMAS)}})['cursor']['firstBatch']:
+        options = info.get('options', {})
+        current[info['name']] = (
+            options.get('validator', {}).get('$jsonSchema'),
+            options.get('validationLevel'),
+            options.get('validationAction')
+        )
+
+    for name, schema in SCHEMAS.items():
+        stored, level, action = current.get(name, (None, None, None))
+        if (stored is not None and _schema_hash(stored) == _schema_hash(schema)
+                and level == VALIDATION_LEVEL and action == validation_action):
+            logger.info(f"Validator unchanged: {name}")
+            continue
+        db.command({
+            'collMod': name,
+            'validator': {'$jsonSchema': schema},
+            'validationLevel': VALIDATION_LEVEL,
+            'validationAction': validation_action
+        })
+        logger.info(f"Updated validator: {name} ({VALIDATION_LEVEL}, {validation_action})")
+
+def init_mongodb(validation_action: str = 'error'):
+    """Initialize MongoDB collections and indexes
+    
+    Args:
+        validation_action: Validator action, 'error' or 'warn' (see apply_validators)
+    """
     try:
         # Connect to MongoDB
-        client = MongoClient('mongodb://localhost:27017/')
+        client = get_client()
         
         # Get or create database
         db_name = 'yt_digest'
@@ -34,8 +86,9 @@ def init_mongodb():
         
         # Create collections if they don't exist
         collections = ['keywords', 'videos', 'transcripts', 'articles']
+        existing = set(db.list_collection_names())
         for collection in collections:
-            if collection not in db.list_collection_names():
+            if collection not in existing:
                 db.create_collection(collection)
                 logger.info(f"Created collection: {collection}")
             else:
@@ -48,95 +101,13 @@ def init_mongodb():
         articles_db = ArticlesDB()
 
 
-        # Define collection schemas
-        db.command({
-            'collMod': 'keywords',
-            'validator': {
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': ['keyword', 'rank', 'score', 'platform', 'region'],
-                    'properties': {
-                        'keyword': {'bsonType': 'string'},
-                        'rank': {'bsonType': 'int'},
-                        'score': {'bsonType': 'int'},
-                        'platform': {'bsonType': 'string'},
-                        'region': {'bsonType': 'string'},
-                        'metadata': {'bsonType': 'object'},
-                        'created_at': {'bsonType': 'date'},
-                        'updated_at': {'bsonType': 'date'}
-                    }
-                }
-            }
-        })
-
-        db.command({
-            'collMod': 'videos',
-            'validator': {
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': [
-                        'keyword_id', 'video_category', 'video_thumbnail_url',
-                        'video_url', 'video_youtube_id', 'video_title', 'video_duration',
-                        'video_views', 'video_likes', 'video_language', 'video_comments'
-                    ],
-                    'properties': {
-                        'keyword_id': {'bsonType': 'objectId'},
-                        'video_category': {'bsonType': 'string'},
-                        'video_thumbnail_url': {'bsonType': 'string'},
-                        'video_url': {'bsonType': 'string'},
-                        'video_youtube_id': {'bsonType': 'string'},
-                        'video_title': {'bsonType': 'string'},
-                        'video_duration': {'bsonType': 'int'},
-                        'video_views': {'bsonType': 'int'},
-                        'video_likes': {'bsonType': 'int'},
-                        'video_language': {'bsonType': 'string'},
-                        'video_comments': {'bsonType': 'int'},
-                        'created_at': {'bsonType': 'date'},
-                        'updated_at': {'bsonType': 'date'}
-                    }
-                }
-            }
-        })
-
-        db.command({
-            'collMod': 'transcripts',
-            'validator': {
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': ['video_id', 'transcript', 'language'],
-                    'properties': {
-                        'video_id': {'bsonType': 'objectId'},
-                        'transcript': {'bsonType': 'string'},
-                        'language': {'bsonType': 'string'},
-                        'created_at': {'bsonType': 'date'},
-                        'updated_at': {'bsonType': 'date'}
-                    }
-                }
-            }
-        })
+        # Apply collection schemas
+        apply_validators(db, validation_action)
 
-        db.command({
-            'collMod': 'articles',
-            'validator': {
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': ['keyword_id', 'transcript_id', 'video_id', 'article_language', 'title', 'content', 'tags', 'seo_metadata'],
-                    'properties': {
-                        'keyword_id': {'bsonType': 'objectId'},
-                        'transcript_id': {'bsonType': 'objectId'},
-                        'video_id': {'bsonType': 'objectId'},
-                        'article_language': {'bsonType': 'string'},
-                        'title': {'bsonType': 'string'},
-                        'content': {'bsonType': 'string'},
-                        'tags': {'bsonType': 'string'},
-                        'seo_metadata': {'bsonType': 'object'},
-                        'published': {'bsonType': 'bool'},
-                        'created_at': {'bsonType': 'date'},
-                        'updated_at': {'bsonType': 'date'}
-                    }
-                }
-            }
-        })
+        # Create the indexes backing the find_by_* queries
+        for db_instance in (keywords_db, videos_db, transcripts_db, articles_db):
+            names = db_instance.create_indexes()
+            logger.info(f"Indexes on {db_instance.collection.name}: {', '.join(names)}")
 
         logger.info("Database initialization completed successfully")
         return {
@@ -150,40 +121,101 @@ def init_mongodb():
         logger.error(f"Error initializing database: {str(e)}")
         raise
 
+def bulk_seed(docs_by_collection: Dict[str, List[dict]]) -> Dict[str, int]:
+    """
+    Bulk-load documents with non-unique secondary indexes dropped, then rebuild them
+    
+    Each dropped index is rebuilt in one pass after the load instead of
+    being maintained on every insert. The _id_ index and unique indexes stay
+    in place, so duplicates are rejected during the load rather than
+    breaking the rebuild and leaving the collection unindexed.
+    
+    Args:
+        docs_by_collection: Documents to insert, keyed by collection name
+        
+    Returns:
+        Number of documents inserted per collection
+    """
+    client = get_client()
+    db = client['yt_digest']
+    counts = {}
+    for collection_name, docs in docs_by_collection.items():
+        collection = db[collection_name]
+        
+        # Record the non-unique secondary indexes so they can be recreated as they were
+        indexes = []
+        for info in collection.list_indexes():
+            if info['name'] == '_id_' or info.get('unique'):
+                continue
+            options = {k: v for k, v in info.items() if k not in ('key', 'v', 'ns')}
+            indexes.append(IndexModel(list(info['key'].items()), **options))
+        for index in indexes:
+            collection.drop_index(index.document['name'])
+        
+        try:
+            inserted = 0
+            if docs:
+                try:
+                    result = collection.insert_many(docs, ordered=False)
+                except BulkWriteError as e:
+                    duplicates = sum(1 for error in e.details.get('writeErrors', []) if error.get('code') == 11000)
+                    if duplicates:
+                        logger.error(
+                            "Seed data for %s violates a unique index: %s duplicate documents were rejected",
+                            collection_name, duplicates
+                        )
+                    raise
+                inserted = len(result.inserted_ids)
+            counts[collection_name] = inserted
+            logger.info(f"Seeded {inserted} documents into {collection_name}")
+        finally:
+            if indexes:
+                names = collection.create_indexes(indexes)
+                logger.info(f"Rebuilt indexes on {collection_name}: {', '.join(names)}")
+    return counts
+
+# Upper bound on concurrent listIndexes calls in print_table_structure
+INDEX_FETCH_WORKERS = 8
+
 def print_table_structure():
     """Print MongoDB collections structure based on actual data"""
     try:
         # Connect to MongoDB
-        client = MongoClient('mongodb://localhost:27017')
+        client = get_client()
         db = client['yt_digest']
         
-        print("\nDatabase Schema:")
-        print("================")
+        # Output is buffered and written once per collection
+        buf = io.StringIO()
+        print("\nDatabase Schema:", file=buf)
+        print("================", file=buf)
         
-        for collection_name in db.list_collection_names():
-            print(f"\nCollection: {collection_name}")
-            print("=" * (len(collection_name) + 11))
+        # Fetch all collection metadata in one listCollections call, and the
+        # per-collection index lists concurrently
+        all_info = {info['name']: info for info in db.list_collections()}
+        with ThreadPoolExecutor(max_workers=min(INDEX_FETCH_WORKERS, max(len(all_info), 1))) as pool:
+            all_indexes = dict(zip(all_info, pool.map(
+                lambda name: list(db[name].list_indexes()), all_info
+            )))
+        
+        for collection_name, info in all_info.items():
+            print(f"\nCollection: {collection_name}", file=buf)
+            print("=" * (len(collection_name) + 11), file=buf)
             
             # Get collection validator
-            collection_info = db.command("listCollections", 
-                                      filter={"name": collection_name})
-            validator = None
-            for info in collection_info['cursor']['firstBatch']:
-                if 'options' in info and 'validator' in info['options']:
-                    validator = info['options']['validator']
+            validator = info.get('options', {}).get('validator')
             
             if validator and '$jsonSchema' in validator:
                 schema = validator['$jsonSchema']
                 
                 # Print required fields
                 if 'required' in schema:
-                    print("\nRequired Fields:")
+                    print("\nRequired Fields:", file=buf)
                     for field in schema['required']:
-                        print(f"  - {field}")
+                        print(f"  - {field}", file=buf)
                 
                 # Print field definitions
                 if 'properties' in schema:
-                    print("\nField Definitions:")
+                    print("\nField Definitions:", file=buf)
                     for field, props in schema['properties'].items():
                         field_type = props.get('bsonType', 'any')
                         desc = props.get('description', '')
@@ -194,14 +226,13 @@ def print_table_structure():
                             field_info += " (required)"
                         if desc:
                             field_info += f"\n    {desc}"
-                        print(field_info)
+                        print(field_info, file=buf)
             else:
-                print("No schema validation defined")
+                print("No schema validation defined", file=buf)
             
             # Print indexes
-            print("\nIndexes:")
-            indexes = db[collection_name].list_indexes()
-            for index in indexes:
+            print("\nIndexes:", file=buf)
+            for index in all_indexes[collection_name]:
                 index_fields = []
                 for field, direction in index['key'].items():
                     direction_str = ' DESC' if direction == -1 else ''
@@ -210,9 +241,13 @@ def print_table_structure():
                 index_info = f"  - {', '.join(index_fields)}"
                 if index.get('unique'):
                     index_info += " (unique)"
-                print(index_info)
+                print(index_info, file=buf)
             
-            print("")
+            print("", file=buf)
+            sys.stdout.write(buf.getvalue())
+            buf = io.StringIO()
+        
+        sys.stdout.write(buf.getvalue())
             
     except Exception as e:
         print(f"Error printing schema: {str(e)}")
@@ -220,12 +255,24 @@ def print_table_structure():
 
 def main():
     """Main function to initialize the database"""
+    parser = argparse.ArgumentParser(description="Initialize the yt_digest database")
+    parser.add_argument('--bulk', metavar='PATH',
+                        help="Seed from a JSON file of {collection: [documents]} (MongoDB extended JSON), "
+                             "dropping indexes during the load and rebuilding them after")
+    parser.add_argument('--warn-only', action='store_true',
+                        help="Log schema violations instead of rejecting documents (tests/development)")
+    args = parser.parse_args()
+    
     try:
-        db_instances = init_mongodb()
+        db_instances = init_mongodb('warn' if args.warn_only else 'error')
         logger.info("Database initialized with collections:")
         for name, db in db_instances.items():
             logger.info(f"- {name}: {db.collection.name}")
         
+        if args.bulk:
+            with open(args.bulk) as f:
+                bulk_seed(json_util.loads(f.read()))
+        
         # Print table structure
         print_table_structure()
     except Exception as e:
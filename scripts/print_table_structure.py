@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+import io
 import json
 from bson import json_util
 import sys
@@ -7,70 +7,79 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from db.client import get_client
+
+# Deepest level of nested documents printed
+MAX_DEPTH = 8
+
 def print_table_structure():
     """Print MongoDB collections structure based on actual data"""
     
     # Connect to MongoDB
-    client = MongoClient('mongodb://localhost:27017')
+    client = get_client()
     db = client['yt_digest']
     
-    # Get all collections
-    collections = db.list_collection_names()
+    # Get all collections and their options in one listCollections call
+    all_info = {info['name']: info for info in db.list_collections()}
     
-    print("\nDatabase Structure:")
-    print("===================")
+    # Output is buffered and written once per collection
+    buf = io.StringIO()
+    print("\nDatabase Structure:", file=buf)
+    print("===================", file=buf)
     
-    for collection_name in collections:
-        print(f"\nCollection: {collection_name}")
-        print("-" * (len(collection_name) + 11))
+    for collection_name, info in all_info.items():
+        print(f"\nCollection: {collection_name}", file=buf)
+        print("-" * (len(collection_name) + 11), file=buf)
         
         # Get collection
         collection = db[collection_name]
         
-        # Get one document to analyze structure
-        sample_doc = collection.find_one()
+        # Sample one random document to analyze structure; $sample uses a
+        # random cursor instead of a collection scan
+        sample_doc = next(collection.aggregate([{'$sample': {'size': 1}}]), None)
         if not sample_doc:
-            print("(Empty collection)")
+            print("(Empty collection)", file=buf)
+            sys.stdout.write(buf.getvalue())
+            buf = io.StringIO()
             continue
             
         # Get validation rules if they exist
-        validation_rules = db.command("listCollections", 
-                                    filter={"name": collection_name})
-        validator = None
-        for doc in validation_rules['cursor']['firstBatch']:
-            if 'options' in doc and 'validator' in doc['options']:
-                validator = doc['options']['validator']
-                
-        # Print document structure
-        def print_structure(doc, indent=2):
-            for key, value in doc.items():
-                if key == '_id':
-                    continue
-                    
-                # Get field type
-                field_type = type(value).__name__
-                
-                # Check if field is required from validator
-                required = False
-                if validator and '$jsonSchema' in validator:
-                    schema = validator['$jsonSchema']
-                    if 'required' in schema and key in schema['required']:
-                        required = True
+        validator = info.get('options', {}).get('validator')
                 
-                # Print field info
-                print(" " * indent + f"{key}: {field_type}")
-                if required:
-                    print(" " * (indent + 2) + "(Required)")
-                
-                # Recursively print nested documents
-                if isinstance(value, dict):
-                    print_structure(value, indent + 2)
+        # Required fields from the validator, if any
+        required = set()
+        if validator and '$jsonSchema' in validator:
+            required = set(validator['$jsonSchema'].get('required', []))
         
-        print_structure(sample_doc)
+        # Walk the document with an explicit stack of item iterators, so nested
+        # fields print right under their parent without recursion
+        stack = [(iter(sample_doc.items()), 2)]
+        while stack:
+            items, indent = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+            key, value = item
+            if key == '_id':
+                continue
+            
+            # Print field info
+            print(" " * indent + f"{key}: {type(value).__name__}", file=buf)
+            if key in required:
+                print(" " * (indent + 2) + "(Required)", file=buf)
+            
+            # Descend into nested documents, up to MAX_DEPTH levels
+            if isinstance(value, dict) and len(stack) < MAX_DEPTH:
+                stack.append((iter(value.items()), indent + 2))
         
-        # Print total documents
-        doc_count = collection.count_documents({})
-        print(f"\nTotal documents: {doc_count}")
+        # Print total documents, from collection metadata rather than a full count
+        doc_count = collection.estimated_document_count()
+        print(f"\nTotal documents: {doc_count}", file=buf)
+        sys.stdout.write(buf.getvalue())
+        buf = io.StringIO()
+    
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     print_table_structure() 
\ No newline at end of file
@@ -0,0 +1,235 @@
+import os
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from util.config import load_config
+
+# Recorded HTTP traffic for tests marked @pytest.mark.vcr
+CASSETTE_DIR = project_root / 'tests' / 'cassettes'
+# YT_DIGEST_LIVE=1 hits the real APIs and re-records the cassettes
+LIVE = os.getenv('YT_DIGEST_LIVE') == '1'
+
+# Languages accepted by Transcriber.transcribe
+TRANSCRIBE_LANGUAGES = ['auto', 'zh', 'en', 'yue', 'ja', 'ko']
+
+def pytest_addoption(parser):
+    parser.addoption('--audio-path', default=None,
+                     help='Path to the audio file for the transcription tests')
+    parser.addoption('--language', choices=TRANSCRIBE_LANGUAGES, default='auto',
+                     help='Language for the transcription tests')
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "vcr: replay recorded HTTP responses from tests/cassettes, skipped without a cassette "
+        "(YT_DIGEST_LIVE=1 records, needs vcrpy)"
+    )
+
+# Heavy dependencies (torch, funasr, googleapiclient, pymongo) are imported
+# inside the fixtures so test files that don't use them still collect.
+
+@pytest.fixture(scope="session")
+def config():
+    """Load configuration from config.yaml"""
+    return load_config(project_root / 'config.yaml')
+
+# Pool sized for the concurrent download/extract/transcribe fixtures
+MONGO_TEST_OPTIONS = {
+    'maxPoolSize': 32,
+    'minPoolSize': 8,
+    'waitQueueTimeoutMS': 5000,
+    'serverSelectionTimeoutMS': 3000,
+    'appname': 'yt-digest-tests',
+}
+
+@pytest.fixture(scope="session")
+def mongo_client():
+    """Shared MongoClient for the whole session, closed once at teardown
+    
+    Created before any DB class connects so they reuse it. The pool is
+    warmed with minPoolSize concurrent pings so fixture threads find open
+    connections.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from db.client import get_client, close_clients
+    client = get_client(**MONGO_TEST_OPTIONS)
+    workers = MONGO_TEST_OPTIONS['minPoolSize']
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: client.admin.command('ping'), range(workers)))
+    yield client
+    close_clients()
+
+@pytest.fixture(scope="session")
+def db_instances(mongo_client):
+    """Initialize database instances"""
+    from db.keywords import KeywordsDB
+    from db.videos import VideosDB
+    from db.transcripts import TranscriptsDB
+    return {
+        'keywords': KeywordsDB(),
+        'videos': VideosDB(),
+        'transcripts': TranscriptsDB()
+    }
+
+@pytest.fixture(scope="session")
+def yt_searcher():
+    """Initialize YouTube searcher"""
+    from lib.youtube.yt_search import YouTubeSearcher
+    return YouTubeSearcher()
+
+@pytest.fixture(scope="session")
+def yt_downloader(config):
+    """Initialize YouTube downloader, stopping its extraction threads at teardown"""
+    from lib.youtube.downloader import YouTubeDownloader
+    with YouTubeDownloader(config) as downloader:
+        yield downloader
+
+@pytest.fixture(scope="session")
+def audio_extractor():
+    """Initialize audio extractor"""
+    from lib.ffmpeg.extractor import FFmpegExtractor
+    return FFmpegExtractor()
+
+@pytest.fixture(scope="session")
+def transcriber():
+    """Initialize transcriber, loading the model once per session"""
+    from lib.transcript.transcriber import Transcriber
+    return Transcriber()
+
+@pytest.fixture(scope="session")
+def vcr_recorder():
+    """VCR configured for the cassette directory, or None when vcrpy is not installed
+    
+    API keys are stripped from recorded requests, and requests are matched
+    without them, so cassettes are safe to commit.
+    """
+    try:
+        import vcr
+    except ImportError:
+        return None
+    return vcr.VCR(
+        cassette_library_dir=str(CASSETTE_DIR),
+        # Re-record live, otherwise replay only and never touch the network
+        record_mode='all' if LIVE else 'none',
+        filter_query_parameters=['key'],
+        filter_headers=['authorization', 'x-goog-api-key'],
+        decode_compressed_response=True,
+        match_on=['method', 'scheme', 'host', 'path', 'query']
+    )
+
+@pytest.fixture(autouse=True)
+def vcr_cassette(request, vcr_recorder):
+    """Run tests marked vcr inside their cassette
+    
+    Offline runs skip marked tests that have no recorded cassette (or no
+    vcrpy); with YT_DIGEST_LIVE=1 they hit the APIs, recording when vcrpy
+    is installed.
+    """
+    if request.node.get_closest_marker('vcr') is None:
+        yield None
+        return
+    name = f"{Path(str(request.node.fspath)).stem}/{request.node.name}.yaml"
+    if not LIVE:
+        if vcr_recorder is None:
+            pytest.skip("vcrpy is not installed; set YT_DIGEST_LIVE=1 to use the live APIs")
+        if not (CASSETTE_DIR / name).exists():
+            pytest.skip(f"No cassette {name}; record it with YT_DIGEST_LIVE=1")
+    if vcr_recorder is None:
+        yield None
+        return
+    with vcr_recorder.use_cassette(name) as cassette:
+        yield cassette
+
+class FakeYouTube:
+    """Offline stand-in for the googleapiclient YouTube service
+    
+    `respond(resource, params)` returns the API response for one
+    `<resource>().list(**params)` call, or raises to fail it. Every executed
+    call is recorded in `calls` and every batch execute in `batches`.
+    """
+    
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+        self.batches = 0
+    
+    def __getattr__(self, resource):
+        if resource.startswith('_'):
+            raise AttributeError(resource)
+        return lambda: _FakeResource(self, resource)
+    
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+class _FakeResource:
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+    
+    def list(self, **params):
+        return _FakeRequest(self.service, self.name, params)
+
+class _FakeRequest:
+    def __init__(self, service, resource, params):
+        self.service = service
+        self.resource = resource
+        self.params = params
+    
+    def execute(self):
+        self.service.calls.append((self.resource, self.params))
+        return self.service.respond(self.resource, self.params)
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+    
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+    
+    def execute(self):
+        self.service.batches += 1
+        for request_id, request in self.requests:
+            try:
+                response = request.execute()
+            except Exception as e:
+                self.callback(request_id, None, e)
+            else:
+                self.callback(request_id, response, None)
+
+@pytest.fixture
+def fake_youtube():
+    """Factory for FakeYouTube services; the API response caches are emptied around the test"""
+    from lib.cache import api_cache, API_TTLS
+    for kind in API_TTLS:
+        api_cache(kind).clear()
+    yield FakeYouTube
+    for kind in API_TTLS:
+        api_cache(kind).clear()
+
+def _empty_device_cache() -> None:
+    """Return cached GPU memory to the driver, if torch is in use"""
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    if torch.backends.mps.is_available():
+        torch.mps.empty_cache()
+
+@pytest.fixture(autouse=True)
+def clear_device_cache():
+    """Start and end every test with an empty CUDA/MPS allocator cache
+    
+    Keeps one test's fragmented VRAM (e.g. after an OOM) from failing the
+    next. torch is never imported just for this.
+    """
+    _empty_device_cache()
+    yield
+    _empty_device_cache()
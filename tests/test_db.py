@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+import pytest
+from bson import ObjectId
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import db.base
+from db.base import BaseDB, OID_TYPES
+from db._compile import make_document_validator
+
+ITEMS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['name', 'ref', 'count'],
+    'properties': {
+        'ref': {'bsonType': 'objectId'},
+        'count': {'bsonType': 'int'},
+    },
+}
+
+class _Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+class FakeCollection:
+    """Records inserted documents instead of talking to MongoDB"""
+
+    def __init__(self, name):
+        self.name = name
+        self.docs = []
+
+    def with_options(self, **options):
+        return self
+
+    def insert_one(self, doc, **kwargs):
+        doc.setdefault('_id', ObjectId())
+        self.docs.append(doc)
+        return _Result(inserted_id=doc['_id'])
+
+    def insert_many(self, docs, **kwargs):
+        for doc in docs:
+            doc.setdefault('_id', ObjectId())
+        self.docs.extend(docs)
+        return _Result(inserted_ids=[doc['_id'] for doc in docs])
+
+class ItemsDB(BaseDB):
+    SCHEMA = {'name': str, 'ref': OID_TYPES, 'count': int}
+    OID_FIELDS = ('ref',)
+    JSON_SCHEMA = ITEMS_SCHEMA
+
+    def __init__(self):
+        super().__init__('items')
+
+@pytest.fixture
+def items_db(monkeypatch):
+    collections = {}
+    fake_client = {'yt_digest': collections}
+    monkeypatch.setattr(db.base, 'get_client', lambda: fake_client)
+    collections['items'] = FakeCollection('items')
+    return ItemsDB()
+
+def test_document_validator_accepts_matching_document():
+    check = make_document_validator(ITEMS_SCHEMA)
+    check({'name': 'a', 'ref': ObjectId(), 'count': 1, 'extra': 'ignored'})
+
+@pytest.mark.parametrize("doc, error", [
+    ({'name': 'a', 'ref': ObjectId()}, ValueError),
+    ({'name': 'a', 'ref': str(ObjectId()), 'count': 1}, TypeError),
+    ({'name': 'a', 'ref': ObjectId(), 'count': True}, TypeError),
+])
+def test_document_validator_rejects(doc, error):
+    check = make_document_validator(ITEMS_SCHEMA)
+    with pytest.raises(error):
+        check(doc)
+
+@pytest.mark.parametrize("kwargs", [{}, {'fast': True}, {'seed': True}])
+def test_insert_many_rejects_invalid_document(items_db, kwargs):
+    docs = [
+        items_db._build_doc('ok', str(ObjectId()), 1),
+        {'name': 'bad', 'ref': str(ObjectId()), 'count': 1},
+    ]
+    with pytest.raises(TypeError):
+        items_db.insert_many(docs, **kwargs)
+    # Checked before the first batch, so nothing was written
+    assert items_db.collection.docs == []
+
+@pytest.mark.parametrize("kwargs", [{'fast': True}, {'seed': True}])
+def test_insert_many_checks_built_documents_when_server_validation_is_skipped(items_db, kwargs):
+    docs = [items_db._build_doc('ok', str(ObjectId()), 1)]
+    docs[0].pop('count')
+    with pytest.raises(ValueError):
+        items_db.insert_many(docs, validated=True, **kwargs)
+
+def test_insert_many_accepts_built_documents(items_db):
+    ref = ObjectId()
+    docs = [items_db._build_doc(f'item {i}', ref, i) for i in range(3)]
+    ids = items_db.insert_many(docs, validated=True, fast=True, batch_size=2)
+
+    assert ids == [str(doc['_id']) for doc in items_db.collection.docs]
+    assert [doc['name'] for doc in items_db.collection.docs] == ['item 0', 'item 1', 'item 2']
+    assert all(doc['ref'] == ref for doc in items_db.collection.docs)
+
+def test_insert_one_fast_rejects_invalid_document(items_db):
+    with pytest.raises(ValueError):
+        items_db.insert_one({'name': 'a'}, fast=True, validated=True)
+    assert items_db.collection.docs == []
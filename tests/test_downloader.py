@@ -2,6 +2,7 @@ import os
 import sys
 from pathlib import Path
 import yaml
+import pytest
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -9,6 +10,138 @@ sys.path.append(str(project_root))
 
 from lib.youtube.downloader import YouTubeDownloader
 
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=pmljvWUrm0I",
+    "https://youtube.com/watch?feature=share&v=pmljvWUrm0I",
+    "https://youtu.be/pmljvWUrm0I",
+    "https://www.youtube.com/embed/pmljvWUrm0I",
+    "https://www.youtube.com/v/pmljvWUrm0I",
+])
+def test_extract_video_id(url):
+    assert YouTubeDownloader.extract_video_id(url) == "pmljvWUrm0I"
+
+def test_extract_video_id_invalid():
+    with pytest.raises(ValueError):
+        YouTubeDownloader.extract_video_id("https://example.com/watch?v=pmljvWUrm0I")
+
+class _FakeExtractor:
+    def __init__(self):
+        self.extracted = []
+    
+    def extract_audio(self, path):
+        if path.endswith('.vtt'):
+            raise RuntimeError(f"No audio stream in {path}")
+        self.extracted.append(path)
+        return {'audio': os.path.splitext(path)[0] + '.m4a'}
+
+def _offline_config(tmp_path, monkeypatch):
+    """config.yaml writing to tmp_path, with ffmpeg replaced by _FakeExtractor"""
+    import lib.youtube.downloader as downloader_module
+    
+    with open(os.path.join(project_root, "config.yaml")) as f:
+        config = yaml.safe_load(f)
+    config['youtube_downloader']['output_dir'] = str(tmp_path)
+    config['youtube_downloader']['video']['postprocess']['enabled'] = False
+    monkeypatch.setattr(downloader_module, 'FFmpegExtractor', _FakeExtractor)
+    return config
+
+def _fake_youtube_dl(tmp_path):
+    """YoutubeDL stand-in that reports a subtitle, then the video, as finished"""
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            self.hooks = opts.get('progress_hooks', [])
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc):
+            return False
+        
+        def extract_info(self, url, download=True):
+            events = [
+                {'status': 'finished', 'filename': str(tmp_path / 'pmljvWUrm0I.en.vtt'),
+                 'info_dict': {'ext': 'vtt', 'url': 'https://example.com/sub.vtt'}},
+                {'status': 'finished', 'filename': str(tmp_path / 'pmljvWUrm0I.mp4'),
+                 'info_dict': {'id': 'pmljvWUrm0I', 'format_id': '18', 'ext': 'mp4'}},
+            ]
+            for event in events:
+                for hook in self.hooks:
+                    hook(event)
+            return {'title': 'title', 'duration': 1}
+    
+    return FakeYoutubeDL
+
+def test_host_slot_shared_between_downloaders(tmp_path, monkeypatch):
+    config = _offline_config(tmp_path, monkeypatch)
+    with YouTubeDownloader(config) as first, YouTubeDownloader(config) as second:
+        assert first.per_host < first.max_workers
+        assert (first._host_slot("https://www.youtube.com/watch?v=pmljvWUrm0I")
+                is second._host_slot("https://youtube.com/watch?v=pmljvWUrm0I"))
+
+def test_download_many_downloads_repeated_video_once(tmp_path, monkeypatch):
+    config = _offline_config(tmp_path, monkeypatch)
+    urls = [
+        "https://www.youtube.com/watch?v=pmljvWUrm0I",
+        "https://youtu.be/aaaaaaaaaaa",
+        "https://youtu.be/pmljvWUrm0I",
+    ]
+    downloaded = []
+    with YouTubeDownloader(config) as downloader:
+        def fake_download_video(url, extract_audio=False):
+            downloaded.append(url)
+            return {'id': downloader.extract_video_id(url), 'subtitles': {}}
+        monkeypatch.setattr(downloader, 'download_video', fake_download_video)
+        results = downloader.download_many(urls)
+    
+    assert sorted(downloaded) == sorted(urls[:2])
+    assert [result['id'] for result in results] == ['pmljvWUrm0I', 'aaaaaaaaaaa', 'pmljvWUrm0I']
+    # Each position gets its own copy
+    assert results[0] is not results[2]
+
+def test_audio_extraction_runs_outside_host_slot(tmp_path, monkeypatch):
+    """ffmpeg must not hold a per-host download slot"""
+    import lib.youtube.downloader as downloader_module
+    
+    config = _offline_config(tmp_path, monkeypatch)
+    # Postprocessors disable the progress-hook path, so extraction runs after the download
+    config['youtube_downloader']['video']['postprocess']['enabled'] = True
+    monkeypatch.setattr(downloader_module.yt_dlp, 'YoutubeDL', _fake_youtube_dl(tmp_path))
+    url = "https://youtu.be/pmljvWUrm0I"
+    slot_free = []
+    
+    with YouTubeDownloader(config) as downloader:
+        def extract_audio(path):
+            slot = downloader._host_slot(url)
+            free = slot.acquire(blocking=False)
+            if free:
+                slot.release()
+            slot_free.append(free)
+            return {'audio': path + '.m4a'}
+        downloader.ffmpeg.extract_audio = extract_audio
+        # Saturate the host so any slot still held by the download shows up
+        held = [downloader._host_slot(url).acquire(blocking=False) for _ in range(downloader.per_host - 1)]
+        try:
+            downloader.download_video(url, extract_audio=True)
+        finally:
+            for acquired in held:
+                if acquired:
+                    downloader._host_slot(url).release()
+    
+    assert slot_free == [True]
+
+def test_download_extracts_audio_from_video_not_subtitles(tmp_path, monkeypatch):
+    """Subtitles finish before the video; only the video is handed to ffmpeg"""
+    import lib.youtube.downloader as downloader_module
+    
+    config = _offline_config(tmp_path, monkeypatch)
+    
+    monkeypatch.setattr(downloader_module.yt_dlp, 'YoutubeDL', _fake_youtube_dl(tmp_path))
+    with YouTubeDownloader(config) as downloader:
+        result = downloader.download_video("https://youtu.be/pmljvWUrm0I", extract_audio=True)
+    
+    assert downloader.ffmpeg.extracted == [str(tmp_path / 'pmljvWUrm0I.mp4')]
+    assert result['audio'] == str(tmp_path / 'pmljvWUrm0I.m4a')
+
 def test_download():
     # Initialize downloader with config
     config_path = os.path.join(project_root, "config.yaml")
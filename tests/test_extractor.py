@@ -8,6 +8,7 @@ import argparse
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+import lib.ffmpeg.extractor as extractor_module
 from lib.ffmpeg.extractor import FFmpegExtractor
 
 # Store command line arguments before they're processed by pytest
@@ -81,7 +82,7 @@ class TestFFmpegExtractor:
         
         # Verify audio file format
         audio_path = result['audio']
-        assert audio_path.endswith('.mp3')
+        assert audio_path.endswith(('.mp3', '.m4a'))
         
         # Verify file sizes
         assert os.path.getsize(audio_path) > 0
@@ -91,6 +92,58 @@ class TestFFmpegExtractor:
         print(f"Output audio: {result['audio']}")
         print(f"Video ID: {result['video_id']}")
 
+    def test_extract_audio_batch(self, setup_test):
+        """Test batch extraction matches single-file extraction"""
+        if not setup_test:
+            pytest.skip("Setup failed - no video path provided")
+
+        extractor = FFmpegExtractor()
+        results = extractor.extract_audio_batch([setup_test['video_path']], setup_test['output_dir'])
+
+        assert len(results) == 1
+        assert results[0]['video_id'] == setup_test['video_id']
+        assert os.path.getsize(results[0]['audio']) > 0
+
+@pytest.fixture
+def offline_extractor(monkeypatch):
+    """FFmpegExtractor whose ffmpeg runs only create the requested outputs"""
+    monkeypatch.setattr(extractor_module, '_find_binaries', lambda: ('ffmpeg', None))
+    monkeypatch.setattr(FFmpegExtractor, '_probe_audio_codec', lambda self, path: 'aac')
+    extractor = FFmpegExtractor()
+    extractor.commands = []
+
+    def fake_run(command):
+        extractor.commands.append(command)
+        for arg in command:
+            if arg.endswith('.m4a'):
+                Path(arg).write_bytes(b'audio')
+
+    monkeypatch.setattr(extractor, '_run', fake_run)
+    return extractor
+
+def test_extract_audio_batch_rejects_colliding_outputs(offline_extractor, tmp_path):
+    paths = []
+    for folder in ('a', 'b'):
+        (tmp_path / folder).mkdir()
+        video = tmp_path / folder / 'same.mp4'
+        video.write_bytes(b'video')
+        paths.append(str(video))
+
+    with pytest.raises(ValueError):
+        offline_extractor.extract_audio_batch(paths, str(tmp_path / 'audio'))
+    assert offline_extractor.commands == []
+
+def test_extract_audio_batch_extracts_repeated_video_once(offline_extractor, tmp_path):
+    video = tmp_path / 'clip.mp4'
+    video.write_bytes(b'video')
+
+    results = offline_extractor.extract_audio_batch([str(video), str(video)], str(tmp_path / 'audio'))
+
+    assert len(offline_extractor.commands) == 1
+    assert offline_extractor.commands[0].count('-i') == 1
+    assert [r['video_id'] for r in results] == ['clip', 'clip']
+    assert results[0] is not results[1]
+
 def main():
     # Parse arguments before running tests
     if len(_ORIGINAL_ARGS) < 1:
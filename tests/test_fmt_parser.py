@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from util.fmt_parser import parse_duration
+
+@pytest.mark.parametrize("duration, seconds", [
+    ("PT7M32S", 452),
+    ("PT1H2M10S", 3730),
+    ("PT1H", 3600),
+    ("PT45S", 45),
+    ("PT2M", 120),
+    ("P1DT2H3M4S", 93784),
+    ("P0D", 0),
+    ("PT1.5S", 1),
+])
+def test_parse_duration(duration, seconds):
+    assert parse_duration(duration) == seconds
+
+@pytest.mark.parametrize("duration", ["", "7M32S", "PT7X", "1:02:10"])
+def test_parse_duration_invalid(duration):
+    with pytest.raises(ValueError):
+        parse_duration(duration)
@@ -56,6 +56,7 @@ class TestKeywordsFetchers:
             Region.SINGAPORE
         ]
     
+    @pytest.mark.vcr
     def test_google_trends(self, regions):
         """Test Google Trends fetcher"""
         for region in regions:
@@ -71,6 +72,7 @@ class TestKeywordsFetchers:
             historical = fetcher.fetch_with_time(start_time, limit=5)
             self._validate_and_print_results("Google Trends (Historical)", historical, region)
     
+    @pytest.mark.vcr
     def test_youtube_trending(self, setup_credentials, regions):
         """Test YouTube Trending fetcher"""
         api_key = setup_credentials['youtube_api_key']
@@ -106,6 +108,103 @@ class TestKeywordsFetchers:
         else:
             print(f"No results found for {platform} in {region}")
 
+_TRENDING_ITEM = {
+    'id': 'pmljvWUrm0I',
+    'snippet': {'title': 'Trending video', 'tags': ['news']},
+    'statistics': {'viewCount': '100'},
+}
+
+def test_youtube_trending_fetch_many_batch_error_after_responses(monkeypatch):
+    """A batch that fails after every response arrived still returns them, using YOUTUBE_API_KEY"""
+    import lib.youtube.yt_search as yt_search
+    from lib.cache import api_cache
+    
+    class FakeBatch:
+        def __init__(self, callback):
+            self.callback = callback
+            self.request_ids = []
+        
+        def add(self, request, request_id):
+            self.request_ids.append(request_id)
+        
+        def execute(self):
+            for request_id in self.request_ids:
+                self.callback(request_id, {'items': [_TRENDING_ITEM]}, None)
+            raise ConnectionError("connection reset after the last part")
+    
+    class FakeYouTube:
+        def new_batch_http_request(self, callback):
+            return FakeBatch(callback)
+        
+        def videos(self):
+            return self
+        
+        def list(self, **params):
+            return params
+    
+    used_keys = []
+    def fake_client(api_key):
+        used_keys.append(api_key)
+        return FakeYouTube()
+    
+    monkeypatch.setenv('YOUTUBE_API_KEY', 'env-key')
+    monkeypatch.setattr(yt_search, 'youtube_client', fake_client)
+    api_cache('trending').clear()
+    try:
+        results = YouTubeTrendingFetcher.fetch_many(['TW', 'JP'], api_key=None)
+    finally:
+        api_cache('trending').clear()
+    
+    assert used_keys == ['env-key']
+    assert {region: [item['keyword'] for item in items] for region, items in results.items()} == {
+        'TW': ['Trending video'],
+        'JP': ['Trending video'],
+    }
+
+def test_youtube_trending_fetch_many_one_batch(fake_youtube, monkeypatch):
+    """Every region goes out in one batch; a failed region returns [] and hits are cached"""
+    import lib.youtube.yt_search as yt_search
+    
+    def respond(resource, params):
+        assert (resource, params['chart']) == ('videos', 'mostPopular')
+        if params['regionCode'] == 'JP':
+            raise RuntimeError("quota exceeded")
+        return {'items': [_TRENDING_ITEM]}
+    
+    youtube = fake_youtube(respond)
+    monkeypatch.setattr(yt_search, 'youtube_client', lambda api_key: youtube)
+    results = YouTubeTrendingFetcher.fetch_many(['TW', 'JP', 'US', 'TW'], api_key='test-key', limit=5)
+    
+    assert youtube.batches == 1
+    assert sorted(params['regionCode'] for _, params in youtube.calls) == ['JP', 'TW', 'US']
+    assert all(params['maxResults'] == 5 for _, params in youtube.calls)
+    assert list(results) == ['TW', 'JP', 'US']
+    assert results['JP'] == []
+    item = results['TW'][0]
+    assert (item['keyword'], item['rank'], item['score']) == ('Trending video', 1, 100)
+    assert item['metadata']['video_id'] == 'pmljvWUrm0I'
+    
+    # Only the failed region is requested again
+    YouTubeTrendingFetcher.fetch_many(['TW', 'JP', 'US'], api_key='test-key', limit=5)
+    assert youtube.batches == 2
+    assert [params['regionCode'] for _, params in youtube.calls[3:]] == ['JP']
+
+def test_youtube_trending_fetch_many_malformed_response(fake_youtube, monkeypatch):
+    """A malformed chart response empties only its own region, like fetch()"""
+    import lib.youtube.yt_search as yt_search
+    
+    def respond(resource, params):
+        if params['regionCode'] == 'JP':
+            return {'items': [{'id': 'x', 'statistics': {'viewCount': '1'}}]}  # no snippet
+        return {'items': [_TRENDING_ITEM]}
+    
+    youtube = fake_youtube(respond)
+    monkeypatch.setattr(yt_search, 'youtube_client', lambda api_key: youtube)
+    results = YouTubeTrendingFetcher.fetch_many(['TW', 'JP'], api_key='test-key')
+    
+    assert results['JP'] == []
+    assert [item['keyword'] for item in results['TW']] == ['Trending video']
+
 def main():
     """Run tests with proper output capture"""
     # Check Python version
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from lib.transcribe import Transcriber
+
+@pytest.mark.parametrize("device, compute_type, expected", [
+    ("cuda", "auto", ("cuda", "int8_float16")),
+    ("cpu", "auto", ("cpu", "int8")),
+    ("cuda", "float16", ("cuda", "float16")),
+    ("cpu", "float32", ("cpu", "float32")),
+])
+def test_resolve_compute_type(device, compute_type, expected):
+    assert Transcriber._resolve(device, compute_type) == expected
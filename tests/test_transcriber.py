@@ -10,40 +10,20 @@ sys.path.append(str(project_root))
 
 from lib.transcript.transcriber import Transcriber
 
-# Store command line arguments before they're processed by pytest
-_ORIGINAL_ARGS = sys.argv[1:]
-
-def parse_args():
-    parser = argparse.ArgumentParser(description='Test audio transcription')
-    parser.add_argument('audio_path', help='Path to the audio file for testing')
-    parser.add_argument('--language', '-l', 
-                       choices=['auto', 'zh', 'en', 'yue', 'ja', 'ko'],
-                       default='auto',
-                       help='Language for transcription')
-    
-    # Parse stored arguments
-    if _ORIGINAL_ARGS:
-        return parser.parse_args(_ORIGINAL_ARGS)
-    else:
-        # For running with pytest directly
-        return parser.parse_args(['--help'])
-
 class TestTranscriber:
     @pytest.fixture(scope="class")
-    def setup_test(self):
-        """Setup test environment"""
-        try:
-            args = parse_args()
-            
-            if args.audio_path and not os.path.exists(args.audio_path):
-                pytest.skip(f"Audio file not found: {args.audio_path}")
-            
-            yield {
-                'audio_path': args.audio_path,
-                'language': args.language
-            }
-        except SystemExit:
-            pytest.skip("No audio path provided")
+    def setup_test(self, request):
+        """Setup test environment from the --audio-path/--language options"""
+        audio_path = request.config.getoption('--audio-path')
+        if not audio_path:
+            pytest.skip("No audio path provided (--audio-path)")
+        if not os.path.exists(audio_path):
+            pytest.skip(f"Audio file not found: {audio_path}")
+        
+        return {
+            'audio_path': audio_path,
+            'language': request.config.getoption('--language')
+        }
     
     @pytest.fixture(scope="class")
     def transcriber(self):
@@ -102,13 +82,17 @@ class TestTranscriber:
         
         return result  # Return result for potential further use
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Test audio transcription')
+    parser.add_argument('audio_path', help='Path to the audio file for testing')
+    parser.add_argument('--language', '-l', 
+                       choices=['auto', 'zh', 'en', 'yue', 'ja', 'ko'],
+                       default='auto',
+                       help='Language for transcription')
+    return parser.parse_args()
+
 def run_transcription_test():
     """Run transcription test directly"""
-    if len(_ORIGINAL_ARGS) < 1:
-        print("Error: Please provide the path to the audio file")
-        print("Usage: python test_transcriber.py <audio_path> [--language <lang>]")
-        sys.exit(1)
-    
     args = parse_args()
     
     try:
@@ -141,8 +125,9 @@ def run_transcription_test():
 
 if __name__ == "__main__":
     if "--pytest" in sys.argv:
-        # Run with pytest
-        pytest.main([__file__, "-v", "--capture=no"])
+        # Run with pytest, forwarding e.g. --audio-path/--language
+        sys.argv.remove("--pytest")
+        pytest.main([__file__, "-v", "--capture=no", *sys.argv[1:]])
     else:
         # Run transcription directly
         run_transcription_test() 
\ No newline at end of file
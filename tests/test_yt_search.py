@@ -37,6 +37,7 @@ class TestYouTubeSearcher:
         """Initialize YouTubeSearcher instance"""
         return YouTubeSearcher(api_key=setup_credentials)
     
+    @pytest.mark.vcr
     def test_search_videos(self, searcher):
         """Test basic video search functionality"""
         query = "python programming"
@@ -62,6 +63,7 @@ class TestYouTubeSearcher:
                 print(f"Thumbnail: {video['thumbnail']['url']}")
                 print("-" * 30)
     
+    @pytest.mark.vcr
     def test_search_with_filters(self, searcher):
         """Test search with additional filters"""
         yesterday = datetime.now(timezone.utc) - timedelta(days=1)
@@ -86,6 +88,7 @@ class TestYouTubeSearcher:
                 print(f"Duration: {video['duration']}")
                 print("-" * 30)
     
+    @pytest.mark.vcr
     def test_search_channels(self, searcher):
         """Test channel search functionality"""
         results = searcher.search_channels(
@@ -111,6 +114,97 @@ class TestYouTubeSearcher:
                 print(f"Thumbnail: {channel['thumbnail_url']}")
                 print("-" * 30)
 
+def _video_item(video_id, thumbnails=None):
+    """videos().list item as returned with part=snippet,statistics,contentDetails"""
+    return {
+        'id': video_id,
+        'snippet': {
+            'title': f'Video {video_id}',
+            'description': 'description',
+            'channelId': 'UC123',
+            'channelTitle': 'Channel',
+            'publishedAt': '2024-01-01T00:00:00Z',
+            'thumbnails': {'high': {'url': f'https://i.ytimg.com/{video_id}.jpg', 'width': 480, 'height': 360}}
+            if thumbnails is None else thumbnails,
+        },
+        'statistics': {'viewCount': '10', 'likeCount': '2'},
+        'contentDetails': {'duration': 'PT1M'},
+    }
+
+@pytest.fixture
+def offline_searcher(fake_youtube):
+    """YouTubeSearcher whose API calls go to a FakeYouTube serving _video_item details"""
+    searches = {
+        'cats': ['aaaaaaaaaaa', 'bbbbbbbbbbb'],
+        'dogs': ['bbbbbbbbbbb', 'ccccccccccc'],
+    }
+    
+    def respond(resource, params):
+        if resource == 'search':
+            if params['q'] not in searches:
+                raise RuntimeError(f"quota exceeded for {params['q']}")
+            return {'items': [{'id': {'videoId': vid}} for vid in searches[params['q']]]}
+        return {'items': [_video_item(vid) for vid in params['id'].split(',')]}
+    
+    searcher = YouTubeSearcher(api_key='test-key')
+    searcher.youtube = fake_youtube(respond)
+    return searcher
+
+def test_build_video(offline_searcher):
+    video = offline_searcher._build_video(_video_item('aaaaaaaaaaa'))
+    assert video['video_id'] == 'aaaaaaaaaaa'
+    assert video['url'] == 'https://www.youtube.com/watch?v=aaaaaaaaaaa'
+    assert video['view_count'] == 10 and video['like_count'] == 2 and video['comment_count'] == 0
+    assert video['duration'] == 'PT1M'
+    assert video['thumbnail_url'] == 'https://i.ytimg.com/aaaaaaaaaaa.jpg'
+    assert video['thumbnail'] == {'url': video['thumbnail_url'], 'width': 480, 'height': 360}
+
+def test_build_video_without_thumbnail(offline_searcher):
+    video = offline_searcher._build_video(_video_item('aaaaaaaaaaa', thumbnails={}))
+    assert video['thumbnail_url'] is None
+    assert video['thumbnail'] is None
+
+def test_build_video_malformed_item(offline_searcher):
+    item = _video_item('aaaaaaaaaaa')
+    del item['contentDetails']
+    assert offline_searcher._build_video(item) is None
+
+def test_search_many_batches_searches_and_shares_details(offline_searcher):
+    results = offline_searcher.search_many(['cats', 'dogs', 'cats', 'birds'], max_results=3, region_code='TW')
+    youtube = offline_searcher.youtube
+    
+    assert {query: [video['video_id'] for video in videos] for query, videos in results.items()} == {
+        'cats': ['aaaaaaaaaaa', 'bbbbbbbbbbb'],
+        'dogs': ['bbbbbbbbbbb', 'ccccccccccc'],
+        # A failed search yields no videos instead of failing the others
+        'birds': [],
+    }
+    # One batch for the distinct queries, one videos().list for the distinct IDs
+    assert youtube.batches == 1
+    assert sorted(params['q'] for resource, params in youtube.calls if resource == 'search') == ['birds', 'cats', 'dogs']
+    assert [params['id'] for resource, params in youtube.calls if resource == 'videos'] == [
+        'aaaaaaaaaaa,bbbbbbbbbbb,ccccccccccc'
+    ]
+    assert all(params['regionCode'] == 'TW' for resource, params in youtube.calls if resource == 'search')
+
+def test_search_many_serves_repeated_searches_from_cache(offline_searcher):
+    offline_searcher.search_many(['cats', 'dogs'], max_results=3)
+    calls = len(offline_searcher.youtube.calls)
+    results = offline_searcher.search_many(['cats', 'dogs'], max_results=3)
+    
+    assert len(offline_searcher.youtube.calls) == calls
+    assert [video['video_id'] for video in results['dogs']] == ['bbbbbbbbbbb', 'ccccccccccc']
+
+def test_search_many_cache_hits_across_published_after_times(offline_searcher):
+    offline_searcher.search_many(['cats'], max_results=3, published_after=datetime(2024, 5, 1, 8, 0))
+    calls = len(offline_searcher.youtube.calls)
+    offline_searcher.search_many(['cats'], max_results=3, published_after=datetime(2024, 5, 1, 9, 30, 15))
+    
+    assert len(offline_searcher.youtube.calls) == calls
+    assert [params['publishedAfter'] for resource, params in offline_searcher.youtube.calls if resource == 'search'] == [
+        '2024-05-01T00:00:00Z'
+    ]
+
 def main():
     """Run tests with proper output capture"""
     pytest.main([__file__, "-v", "--capture=no"])
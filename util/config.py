@@ -0,0 +1,23 @@
+from functools import lru_cache
+import os
+from typing import Any, Dict, Union
+import yaml
+
+# libyaml's C loader when available, several times faster than the pure-Python one
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@lru_cache(maxsize=8)
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return yaml.load(f, Loader=_Loader)
+
+def load_config(path: Union[str, os.PathLike] = 'config.yaml') -> Dict[str, Any]:
+    """Load a YAML config file, parsing each path once per process
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed config; shared between callers, so treat it as read-only
+    """
+    return _load(os.path.abspath(path))
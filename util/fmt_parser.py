@@ -1,3 +1,11 @@
+from functools import lru_cache
+import re
+
+# ISO 8601 durations as returned by the YouTube API: P[nD][T[nH][nM][n[.f]S]]
+_DURATION_RE = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)(?:\.\d+)?S)?)?')
+
+# Durations repeat heavily across search results
+@lru_cache(maxsize=2048)
 def parse_duration(duration: str) -> int:
     """Convert ISO 8601 duration to seconds
     
@@ -5,31 +13,24 @@ def parse_duration(duration: str) -> int:
         duration: Duration string in ISO 8601 format (e.g. 'PT1H2M10S')
         
     Returns:
-        Duration in seconds
+        Duration in seconds (fractional seconds are truncated)
+        
+    Raises:
+        ValueError: If duration is not an ISO 8601 duration
         
     Examples:
         >>> parse_duration('PT7M32S')
         452
         >>> parse_duration('PT1H2M10S')
         3730
+        >>> parse_duration('P1DT1S')
+        86401
     """
-    # Remove PT from start
-    duration = duration.replace('PT', '')
-    seconds = 0
-    
-    # Handle hours
-    if 'H' in duration:
-        hours, duration = duration.split('H')
-        seconds += int(hours) * 3600
-    
-    # Handle minutes
-    if 'M' in duration:
-        minutes, duration = duration.split('M')
-        seconds += int(minutes) * 60
-    
-    # Handle seconds
-    if 'S' in duration:
-        s, _ = duration.split('S')
-        seconds += int(s)
-    
-    return seconds
+    match = _DURATION_RE.fullmatch(duration)
+    if match is None:
+        raise ValueError(f"Invalid ISO 8601 duration: {duration!r}")
+    days, hours, minutes, seconds = match.groups()
+    return (int(days or 0) * 86400
+            + int(hours or 0) * 3600
+            + int(minutes or 0) * 60
+            + int(seconds or 0))
@@ -1,8 +1,11 @@
 import logging
 from pathlib import Path
-import yaml
 from datetime import datetime, timedelta
 from typing import List, Dict
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
 import sys
 import os
 from dotenv import load_dotenv
@@ -13,12 +16,9 @@ sys.path.append(str(project_root))
 from db.keywords import KeywordsDB
 from db.videos import VideosDB
 from db.transcripts import TranscriptsDB
-from lib.youtube.yt_search import YouTubeSearcher
-from lib.youtube.downloader import YouTubeDownloader
-from lib.ffmpeg.extractor import FFmpegExtractor
-from lib.transcript.transcriber import Transcriber
 from lib.keywords.google_trends import GoogleTrendsFetcher
 from lib.keywords.youtube_trending import YouTubeTrendingFetcher
+from util.config import load_config
 from util.fmt_parser import parse_duration
 from lib.region import Region
 
@@ -71,111 +71,164 @@ for name in third_party_modules:
     module_logger = logging.getLogger(name)
     module_logger.setLevel(logging.WARNING)
 
+# Sentinel closing the download -> transcribe queue
+_DONE = object()
 
 class DailyWorkflow:
     def __init__(self, config_path: str = 'config.yaml', api_key: str = None):
         """Initialize workflow with configuration"""
-        # Load config
-        with open(config_path) as f:
-            self.config = yaml.safe_load(f)
+        # Load config (libyaml parser, parsed once per path)
+        self.config = load_config(config_path)
         # Initialize components
         self.keywords_db = KeywordsDB()
         self.videos_db = VideosDB()
         self.transcripts_db = TranscriptsDB()
-        self.yt_searcher = YouTubeSearcher(api_key=api_key)
-        self.yt_downloader = YouTubeDownloader(self.config)
-        self.audio_extractor = FFmpegExtractor()
-        self.transcriber = Transcriber()
+        self.api_key = api_key
+        # yt_searcher, yt_downloader, audio_extractor and transcriber are
+        # created on first use so keyword-only runs skip their imports
         # Initialize keyword fetchers
         self.keyword_fetchers = {
             region: {
                 'google_trends': GoogleTrendsFetcher(region),
-                #'youtube_trending': YouTubeTrendingFetcher(region, api_key)
+                # youtube_trending is fetched for all regions at once, see _keyword_sources
             }
             for region in self.config['regions']
         }
+    
+    @cached_property
+    def yt_searcher(self):
+        """YouTube search client (imports googleapiclient on first use)"""
+        from lib.youtube.yt_search import YouTubeSearcher
+        return YouTubeSearcher(api_key=self.api_key)
+    
+    @cached_property
+    def yt_downloader(self):
+        """Video downloader (imports yt_dlp on first use)"""
+        from lib.youtube.downloader import YouTubeDownloader
+        return YouTubeDownloader(self.config)
+    
+    @cached_property
+    def audio_extractor(self):
+        """FFmpeg audio extractor"""
+        from lib.ffmpeg.extractor import FFmpegExtractor
+        return FFmpegExtractor()
+    
+    @cached_property
+    def transcriber(self):
+        """SenseVoice transcriber (imports torch and funasr on first use)"""
+        from lib.transcript.transcriber import Transcriber
+        return Transcriber()
+    
+    def _keyword_sources(self):
+        """Yield (region, platform, fetch) for every configured keyword source"""
+        for region, fetchers in self.keyword_fetchers.items():
+            for platform, fetcher in fetchers.items():
+                yield region, platform, fetcher.fetch
+        
+        if self.config.get('keywords', {}).get('youtube_trending', False):
+            # One batch request covers the charts of every region; a failure
+            # here must not drop the rows already collected from other sources
+            try:
+                trending = YouTubeTrendingFetcher.fetch_many(self.config['regions'], self.api_key)
+            except Exception as e:
+                logger.error("Error fetching keywords for youtube_trending: %s", e)
+                return
+            for region in self.config['regions']:
+                yield region, 'youtube_trending', lambda region=region: trending.get(region, [])
+    
     def fetch_trending_keywords(self) -> List[str]:
         """Fetch trending keywords from all sources and regions"""
-        keyword_ids = []
+        keyword_rows = []
         
-        # Iterate through each region's fetchers
-        for region, fetchers in self.keyword_fetchers.items():
-            for platform, fetcher in fetchers.items():
-                try:
-                    keywords = fetcher.fetch()
-                    logger.debug(f"keywords: {keywords}")
-                    logger.info(f"Fetched {len(keywords)} keywords from {platform} for {region}")
+        # Checked once rather than per keyword
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # Iterate through each region's keyword sources
+        for region, platform, fetch in self._keyword_sources():
+            # Per-source constants, not recomputed for every keyword
+            region_str = region.value if isinstance(region, Region) else str(region)
+            platform_str = str(platform)
+            try:
+                keywords = fetch()
+                if debug:
+                    logger.debug("keywords: %s", keywords)
+                logger.info("Fetched %s keywords from %s for %s", len(keywords), platform_str, region_str)
+                
+                for keyword_data in keywords:
+                    if debug:
+                        logger.debug("Processing keyword data: %s", keyword_data)
                     
-                    for keyword_data in keywords:
-                        logger.debug(f"Processing keyword data: {keyword_data}")
-                        
-                        # Convert Region enum to string
-                        metadata = keyword_data.get('metadata', {})
-                        if 'region' in metadata and isinstance(metadata['region'], Region):
-                            metadata['region'] = metadata['region'].value
-                        
-                        # Ensure score is an integer
-                        score = keyword_data.get('score')
-                        if score is None:
-                            score = 0
+                    # Convert Region enum to string
+                    metadata = keyword_data.get('metadata')
+                    if metadata is None:
+                        metadata = {}
+                    elif not isinstance(metadata, dict):
+                        metadata = dict(metadata)
+                    if isinstance(metadata.get('region'), Region):
+                        metadata['region'] = metadata['region'].value
+                    
+                    # Ensure all required fields have correct types
+                    try:
+                        keyword_rows.append({
+                            'keyword': str(keyword_data['keyword']),  # Ensure string
+                            'rank': int(keyword_data['rank']),       # Ensure int
+                            'score': int(keyword_data.get('score') or 0),  # Ensure int, None -> 0
+                            'platform': platform_str,
+                            'region': region_str,
+                            'metadata': metadata,
+                        })
+                    except (ValueError, TypeError) as e:
+                        logger.error("Invalid data type in keyword data: %s", e)
+                        logger.error("Problematic data: %s", keyword_data)
+                        continue
                         
-                        # Ensure all required fields have correct types
-                        try:
-                            insert_data = {
-                                'keyword': str(keyword_data['keyword']),  # Ensure string
-                                'rank': int(keyword_data['rank']),       # Ensure int
-                                'score': int(score),                     # Ensure int
-                                'platform': str(platform),               # Ensure string
-                                'region': str(region.value if isinstance(region, Region) else region),  # Ensure string
-                                'metadata': dict(metadata or {}),        # Ensure dict
-                            }
-                            #logger.debug(f"Inserting keyword with data: {insert_data}")
-                            
-                            keyword_id = self.keywords_db.insert_keyword(**insert_data)
-                            keyword_ids.append(keyword_id)
-                            logger.info(
-                                f"Inserted keyword: {keyword_data['keyword']} "
-                                f"(rank: {keyword_data['rank']}, score: {score}, "
-                                f"platform: {platform}, region: {region})"
-                            )
-                        except (ValueError, TypeError) as e:
-                            logger.error(f"Invalid data type in keyword data: {e}")
-                            logger.error(f"Problematic data: {keyword_data}")
-                            continue
-                            
-                except Exception as e:
-                    logger.error(
-                        f"Error fetching keywords for {platform} in {region}: {e}"
-                    )
-                    continue
+            except Exception as e:
+                logger.error("Error fetching keywords for %s in %s: %s", platform_str, region_str, e)
+                continue
         
-        if not keyword_ids:
+        if not keyword_rows:
             logger.warning("No keywords were fetched from any source")
+            return []
+        
+        # Insert all keywords with batched writes
+        keyword_ids = self.keywords_db.insert_keywords_bulk(keyword_rows)
+        logger.info("Inserted %s keywords", len(keyword_ids))
             
         return keyword_ids
     
     def search_videos(self, keyword_ids: List[str]) -> List[str]:
         """Search videos for keywords"""
-        video_ids = []
-        
+        # Load every keyword with one query, then batch the searches per region
+        keywords = self.keywords_db.find_many(keyword_ids)
+        by_region: Dict[str, List[str]] = {}
+        # A keyword trending on several platforms is searched (and stored) once per region
+        seen = set()
         for keyword_id in keyword_ids:
-            keyword_data = self.keywords_db.find_by_id(keyword_id)
+            keyword_data = keywords.get(keyword_id)
             if not keyword_data:
                 continue
-                
-            videos = self.yt_searcher.search(
-                query=keyword_data['keyword'],
+            key = (keyword_data['keyword'].casefold(), keyword_data['region'])
+            if key in seen:
+                continue
+            seen.add(key)
+            by_region.setdefault(keyword_data['region'], []).append(keyword_id)
+        
+        published_after = datetime.now() - timedelta(days=7)
+        video_rows = []
+        for region_code, region_keyword_ids in by_region.items():
+            results = self.yt_searcher.search_many(
+                [keywords[keyword_id]['keyword'] for keyword_id in region_keyword_ids],
                 max_results=3,
-                published_after=datetime.now() - timedelta(days=7),
-                region_code=keyword_data['region']
+                published_after=published_after,
+                region_code=region_code
             )
             
-            for video in videos:
-                # 修正 video_data 結構以符合 schema
-                video_data = {
+            # 修正 video_data 結構以符合 schema
+            video_rows.extend([
+                {
                     'keyword_id': keyword_id,
                     'video_category': 'education',
-                    'video_thumbnail_url': video['thumbnail_url'],
+                    'video_thumbnail_url': video['thumbnail_url'] or '',  # None when the video has no thumbnail
                     'video_url': video['url'],
                     'video_youtube_id': video['video_id'],  # 修正: video_id -> video_youtube_id
                     'video_title': video['title'],
@@ -185,76 +238,186 @@ class DailyWorkflow:
                     'video_language': 'en',
                     'video_comments': int(video['comment_count'])  # 確保是整數
                 }
-                video_id = self.videos_db.insert_video(**video_data)
-                video_ids.append(video_id)
-                logger.info(f"Inserted video: {video['title']}")
-                
+                for keyword_id in region_keyword_ids
+                for video in results.get(keywords[keyword_id]['keyword'], [])
+            ])
+        
+        if not video_rows:
+            return []
+        
+        # Insert all videos with batched writes
+        video_ids = self.videos_db.insert_videos_bulk(video_rows)
+        logger.info("Inserted %s videos", len(video_ids))
         return video_ids
     
-    def download_videos(self, video_ids: List[str]) -> List[Path]:
-        """Download videos"""
+    def _audio_path(self, result: Dict[str, str]) -> str:
+        """Return the extracted audio of a download, removing the video unless it is kept"""
+        logger.info("Downloaded video to: %s (audio: %s)", result['video'], result['audio'])
+        if not self.config['youtube_downloader'].get('keep_video', True):
+            os.remove(result['video'])
+        return result['audio']
+    
+    def _download_video(self, video_url: str) -> str:
+        """Download one video and return the path of its extracted audio"""
+        return self._audio_path(self.yt_downloader.download_video(
+            url=video_url,
+            extract_audio=True
+        ))
+    
+    def download_videos(self, video_ids: List[str]) -> Dict[str, str]:
+        """Download videos and extract their audio
+        
+        Returns:
+            Mapping of video ID to extracted audio path, which is what the
+            transcriber reads instead of decoding the whole video again
+        """
         path_map = {}
+        # Load every video document with one query
+        videos = self.videos_db.find_many(video_ids)
+        found = [video_id for video_id in video_ids if video_id in videos]
         
-        for video_id in video_ids:
-            video_data = self.videos_db.find_by_id(video_id)
-            if not video_data:
+        # Download concurrently; results come back in input order
+        results = self.yt_downloader.download_many(
+            [videos[video_id]['video_url'] for video_id in found],
+            extract_audio=True
+        )
+        # The same YouTube video can belong to several keywords; handle its files once
+        audio_by_video: Dict[str, str] = {}
+        for video_id, result in zip(found, results):
+            if 'error' in result:
+                logger.error("Failed to download video %s: %s", video_id, result['error'])
                 continue
-                
-            output_path = self.yt_downloader.download_video(
-                url=video_data['video_url'],
-                extract_audio=False
-            )
-            path_map[video_id] = output_path['video']
-            logger.info(f"Downloaded video to: {output_path}")
+            if result['video'] not in audio_by_video:
+                audio_by_video[result['video']] = self._audio_path(result)
+            path_map[video_id] = audio_by_video[result['video']]
             
         return path_map
     
     def transcribe_videos(self, video_ids: List[str], video_paths: Dict[str, str]):
-        """Transcribe downloaded videos"""
-        for video_id in video_ids:
-            video_path = video_paths.get(video_id)
-            if not video_path:
-                continue
-            
-            try:
-                # Transcribe video
-                transcript = self.transcriber.transcribe(video_path)
-                
-                # Insert transcript
-                self.transcripts_db.insert_transcript(
-                    video_id=video_id,
-                    transcript=transcript['text'],
-                    language=transcript['language']
-                )
-                
-                logger.info(f"Transcribed video {video_id}")
-                
-            except Exception as e:
-                logger.error(f"Failed to transcribe video {video_id}: {e}")
+        """Transcribe downloaded videos in one batched model call"""
+        pending = [(video_id, video_paths[video_id]) for video_id in video_ids if video_paths.get(video_id)]
+        if not pending:
+            return
+        
+        # Longest first (file size as a cheap duration proxy) so the batch
+        # shrinks as the short clips finish
+        pending.sort(key=lambda item: os.path.getsize(item[1]) if os.path.exists(item[1]) else 0, reverse=True)
+        
+        results = self.transcriber.transcribe_batch(
+            [path for _, path in pending],
+            batch_size_s=self.config.get('transcriber', {}).get('batch_size_s', 60)
+        )
+        
+        # Failed files come back as error entries and are skipped individually
+        transcript_rows = []
+        for (video_id, _), transcript in zip(pending, results):
+            if 'error' in transcript:
+                logger.error("Failed to transcribe video %s: %s", video_id, transcript['error'])
                 continue
+            transcript_rows.append({
+                'video_id': video_id,
+                'transcript': transcript['text'],
+                'language': transcript['language']
+            })
+            logger.info("Transcribed video %s", video_id)
+        
+        if transcript_rows:
+            self.transcripts_db.insert_transcripts_bulk(transcript_rows)
+    
+    def download_and_transcribe(self, video_ids: List[str]) -> Dict[str, str]:
+        """
+        Download videos and transcribe them as they arrive
+        
+        Downloads run in a thread pool (network and subprocess bound) and feed
+        a queue drained by one transcriber thread, which keeps the model on a
+        single worker. Whatever has arrived is transcribed as one batch of up
+        to transcriber.max_batch files.
+        
+        Returns:
+            Mapping of video ID to extracted audio path
+        """
+        path_queue: "queue.Queue" = queue.Queue()
+        max_batch = self.config.get('transcriber', {}).get('max_batch', 8)
+        
+        def transcribe_worker():
+            done = False
+            while not done:
+                batch = [path_queue.get()]
+                # Take whatever else is already waiting, up to max_batch
+                while len(batch) < max_batch:
+                    try:
+                        batch.append(path_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _DONE in batch:
+                    done = True
+                    batch = [item for item in batch if item is not _DONE]
+                if not batch:
+                    continue
+                try:
+                    self.transcribe_videos([video_id for video_id, _ in batch], dict(batch))
+                except Exception as e:
+                    logger.error("Failed to transcribe batch of %s videos: %s", len(batch), e)
+        
+        # Load every video document with one query, before the worker starts
+        # so a failed query cannot leave it waiting for _DONE
+        videos = self.videos_db.find_many(video_ids)
+        transcriber_thread = threading.Thread(target=transcribe_worker, name='transcriber')
+        transcriber_thread.start()
+        path_map = {}
+        try:
+            # Download each YouTube video once, even when several keywords found it
+            ids_by_video: Dict[str, List[str]] = {}
+            for video_id in video_ids:
+                if video_id in videos:
+                    key = self.yt_downloader._video_key(videos[video_id]['video_url'])
+                    ids_by_video.setdefault(key, []).append(video_id)
+            with ThreadPoolExecutor(max_workers=self.yt_downloader.max_workers) as pool:
+                futures = {
+                    pool.submit(self._download_video, videos[ids[0]]['video_url']): ids
+                    for ids in ids_by_video.values()
+                }
+                for future in as_completed(futures):
+                    ids = futures[future]
+                    try:
+                        video_path = future.result()
+                    except Exception as e:
+                        logger.error("Failed to download video %s: %s", ', '.join(map(str, ids)), e)
+                        continue
+                    for video_id in ids:
+                        path_map[video_id] = video_path
+                        path_queue.put((video_id, video_path))
+        finally:
+            path_queue.put(_DONE)
+            transcriber_thread.join()
+        return path_map
     
     def run(self):
         """Run the complete workflow"""
         try:
             # 1. Fetch trending keywords
             keyword_ids = self.fetch_trending_keywords()
-            logger.info(f"Fetched {len(keyword_ids)} keywords")
+            logger.info("Fetched %s keywords", len(keyword_ids))
             
             # 2. Search videos for keywords
             video_ids = self.search_videos(keyword_ids)
-            logger.info(f"Found {len(video_ids)} videos")
-            
-            # 3. Download videos
-            video_paths = self.download_videos(video_ids)
-            logger.info(f"Downloaded {len(video_paths)} videos")
+            logger.info("Found %s videos", len(video_ids))
             
-            # 4. Transcribe videos
-            self.transcribe_videos(video_ids, video_paths)
+            # 3-4. Download videos, transcribing each batch as it arrives
+            video_paths = self.download_and_transcribe(video_ids)
+            logger.info("Downloaded %s videos", len(video_paths))
             logger.info("Workflow completed successfully")
             
         except Exception as e:
-            logger.error(f"Error in workflow: {e}")
+            logger.error("Error in workflow: %s", e)
             raise
+        finally:
+            # Free the model (and VRAM) once the whole run is transcribed
+            if 'transcriber' in self.__dict__:
+                self.transcriber.release()
+            # Stop the downloader's audio extraction threads
+            if 'yt_downloader' in self.__dict__:
+                self.yt_downloader.close()
 
 def main():
     """Main entry point"""
@@ -273,7 +436,7 @@ def main():
         print('run workflow')
         workflow.run()
     except Exception as e:
-        logger.error(f"Failed to run workflow: {e}")
+        logger.error("Failed to run workflow: %s", e)
         exit(1)
 
 if __name__ == "__main__":